@@ -2,16 +2,23 @@
 Éditeur de Texte Augmenté par l'IA pour le Malagasy
 Application Flask principale
 """
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
+import atexit
+import json
 from flask_cors import CORS
 import os
 from modules.spell_checker import SpellChecker
 from modules.autocomplete import AutoComplete
+from modules.online_ngrams import OnlineNgramLearner
+from modules.autocomplete_sessions import AutoCompleteSessions
 from modules.translator import Translator
 from modules.sentiment_analyzer import SentimentAnalyzer
+from modules.sentiment_bulk import SentimentPool, analyze_bulk
 from modules.lemmatizer import Lemmatizer
+from modules.root_index import RootIndex
 from modules.ner import NamedEntityRecognizer
 from modules.tts import TextToSpeech
+from modules.tts_jobs import TTSJobQueue
 
 app = Flask(__name__)
 CORS(app)
@@ -19,11 +26,26 @@ CORS(app)
 # Initialisation des modules IA
 spell_checker = SpellChecker()
 autocomplete = AutoComplete()
-translator = Translator()
-sentiment_analyzer = SentimentAnalyzer()
+autocomplete.set_learner(OnlineNgramLearner(
+    autocomplete.ngrams,
+    autocomplete.word_freq,
+    n=autocomplete.n,
+    path=os.path.join('data', 'learned_ngrams.json')
+))
+autocomplete_sessions = AutoCompleteSessions(autocomplete)
 lemmatizer = Lemmatizer()
+root_index = RootIndex(lemmatizer)
+translator = Translator(lemmatizer=lemmatizer, spell_checker=spell_checker)
+sentiment_analyzer = SentimentAnalyzer()
+# Pool partagé des analyses en masse, créé avant le démarrage des threads
+sentiment_pool = SentimentPool(sentiment_analyzer, max_jobs=2)
+atexit.register(sentiment_pool.close)
 ner = NamedEntityRecognizer()
 tts = TextToSpeech()
+tts_jobs = TTSJobQueue(tts)
+autocomplete.learner.start()
+# Dernière sauvegarde des comptes appris à l'arrêt (le thread est un démon)
+atexit.register(autocomplete.learner.stop)
 
 @app.route('/')
 def index():
@@ -39,33 +61,166 @@ def check_spelling():
     result = spell_checker.check(word)
     return jsonify(result)
 
+@app.route('/api/check-document', methods=['POST'])
+def check_document():
+    """Vérifie l'orthographe d'un texte complet en une seule requête"""
+    data = request.get_json()
+    text = data.get('text', '')
+    
+    result = spell_checker.check_document(text)
+    return jsonify(result)
+
+@app.route('/api/spell-cache-stats', methods=['GET'])
+def spell_cache_stats():
+    """Statistiques des caches du correcteur orthographique"""
+    return jsonify(spell_checker.cache_stats())
+
 @app.route('/api/autocomplete', methods=['POST'])
 def get_autocomplete():
     """Suggestions de mots suivants"""
     data = request.get_json()
+    
+    # Session : le client n'envoie que le texte ajouté (delta)
+    if 'session_id' in data:
+        result = autocomplete_sessions.update(data['session_id'], data.get('delta', ''))
+        if result is None:
+            return jsonify({'error': 'session_expired'}), 404
+        return jsonify(result)
+    
     context = data.get('context', '')
     
     suggestions = autocomplete.predict_next_word(context)
     return jsonify({'suggestions': suggestions})
 
+@app.route('/api/autocomplete/session', methods=['POST'])
+def create_autocomplete_session():
+    """Crée une session d'autocomplétion à partir du contexte complet"""
+    data = request.get_json()
+    context = data.get('context', '')
+    
+    result = autocomplete_sessions.create(context)
+    return jsonify(result)
+
+@app.route('/api/autocomplete/learn', methods=['POST'])
+def learn_autocomplete():
+    """Apprend le texte accepté (suggestion choisie ou texte libre)"""
+    data = request.get_json()
+    
+    if data.get('word'):
+        autocomplete.learn_accepted(data.get('context', ''), data['word'])
+    else:
+        autocomplete.learn(data.get('text', ''))
+    return jsonify({'status': 'ok'})
+
+@app.route('/api/complete-word', methods=['POST'])
+def complete_word():
+    """Complète le mot en cours de saisie"""
+    data = request.get_json()
+    context = data.get('context', '')
+    
+    prefix, suggestions = autocomplete.complete_current_word(context)
+    return jsonify({'prefix': prefix, 'suggestions': suggestions})
+
 @app.route('/api/translate', methods=['POST'])
 def translate_word():
     """Traduit un mot malagasy vers français"""
     data = request.get_json()
     word = data.get('word', '')
     
-    translation = translator.translate(word)
-    return jsonify({'translation': translation})
+    result = translator.translate_with_fallback(word)
+    return jsonify(result)
+
+@app.route('/api/translate-text', methods=['POST'])
+def translate_text():
+    """Traduit un texte complet (expressions comprises) en une seule requête"""
+    data = request.get_json()
+    text = data.get('text', '')
+    
+    result = translator.translate_text(text)
+    return jsonify(result)
+
+@app.route('/api/translate-reverse', methods=['POST'])
+def translate_reverse():
+    """Recherche français -> malagasy (terme exact ou préfixe)"""
+    data = request.get_json()
+    word = data.get('word', '')
+    
+    if data.get('prefix'):
+        return jsonify({'results': translator.search_french(word)})
+    return jsonify({'malagasy': translator.reverse_lookup(word)})
 
 @app.route('/api/analyze-sentiment', methods=['POST'])
 def analyze_sentiment():
-    """Analyse le sentiment d'un texte"""
+    """
+    Analyse le sentiment d'un texte ; avec 'mode' ('paragraph' ou
+    'sentence'), le document est analysé segment par segment
+    """
     data = request.get_json()
     text = data.get('text', '')
+    mode = data.get('mode')
     
-    sentiment = sentiment_analyzer.analyze(text)
+    if mode is not None:
+        try:
+            sentiment = sentiment_analyzer.analyze_document(
+                text, mode=mode, compact=data.get('compact', False)
+            )
+        except ValueError:
+            return jsonify({'error': 'invalid_mode'}), 400
+    else:
+        sentiment = sentiment_analyzer.analyze(text)
     return jsonify(sentiment)
 
+@app.route('/api/analyze-sentiment-bulk', methods=['POST'])
+def analyze_sentiment_bulk():
+    """
+    Analyse le sentiment d'une liste de documents ({'documents': [{'id', 'text'}]}
+    ou {'texts': [...]}) ; les résultats sont envoyés en NDJSON, dans l'ordre
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'invalid_documents'}), 400
+    
+    # Valider avant de commencer la réponse en flux
+    documents = data.get('documents')
+    if documents is None:
+        documents = data.get('texts', [])
+    if not isinstance(documents, list):
+        return jsonify({'error': 'invalid_documents'}), 400
+    
+    normalized = []
+    for i, document in enumerate(documents):
+        if isinstance(document, str):
+            document = {'text': document}
+        if not isinstance(document, dict) or not isinstance(document.get('text', ''), str):
+            return jsonify({'error': 'invalid_document', 'index': i}), 400
+        normalized.append({'id': document.get('id', i), 'text': document.get('text', '')})
+    
+    chunksize = data.get('chunksize', 64)
+    if not isinstance(chunksize, int) or isinstance(chunksize, bool) or chunksize < 1:
+        return jsonify({'error': 'invalid_chunksize'}), 400
+    
+    # Le pool partagé ne vaut la peine que pour les gros lots ; sinon
+    # l'analyseur de l'application est réutilisé dans la requête
+    pool = None
+    if len(normalized) >= 1000:
+        if not sentiment_pool.acquire():
+            return jsonify({'error': 'busy'}), 429
+        pool = sentiment_pool
+    
+    results = analyze_bulk(normalized, workers=1, chunksize=chunksize,
+                           compact=bool(data.get('compact', True)),
+                           analyzer=sentiment_analyzer, pool=pool)
+    
+    def generate():
+        for result in results:
+            yield json.dumps(result, ensure_ascii=False) + '\n'
+    
+    response = Response(generate(), mimetype='application/x-ndjson')
+    if pool is not None:
+        # Place libérée à la fin de la réponse (ou à la déconnexion du client)
+        response.call_on_close(pool.release)
+    return response
+
 @app.route('/api/lemmatize', methods=['POST'])
 def lemmatize_word():
     """Trouve la racine d'un mot"""
@@ -75,6 +230,35 @@ def lemmatize_word():
     lemma = lemmatizer.get_lemma(word)
     return jsonify({'lemma': lemma})
 
+@app.route('/api/lemmatize-text', methods=['POST'])
+def lemmatize_text():
+    """Trouve la racine de chaque mot d'un texte"""
+    data = request.get_json()
+    text = data.get('text', '')
+    
+    return jsonify(lemmatizer.lemmatize_text(text))
+
+@app.route('/api/search-root', methods=['POST'])
+def search_root():
+    """Trouve les formes dérivées d'une racine (asa -> miasa, fiasana...)"""
+    data = request.get_json()
+    root = data.get('root', '')
+    limit = data.get('limit')
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+        return jsonify({'error': 'invalid_limit'}), 400
+    
+    return jsonify({
+        'roots': root_index.roots(root),
+        'forms': root_index.search(root, limit)
+    })
+
+@app.route('/api/index-document', methods=['POST'])
+def index_document():
+    """Ajoute les mots d'un document à l'index des racines"""
+    data = request.get_json()
+    root_index.add_document(data.get('text', ''))
+    return jsonify({'status': 'ok', 'forms': len(root_index)})
+
 @app.route('/api/extract-entities', methods=['POST'])
 def extract_entities():
     """Extrait les entités nommées"""
@@ -84,6 +268,30 @@ def extract_entities():
     entities = ner.extract(text)
     return jsonify({'entities': entities})
 
+@app.route('/api/reload-gazetteers', methods=['POST'])
+def reload_gazetteers():
+    """
+    Recharge les gazetteers (l'extraction continue pendant ce temps) ; avec
+    'wait', attend la fin et retourne l'erreur éventuelle
+    """
+    data = request.get_json(silent=True) or {}
+    
+    if data.get('wait'):
+        try:
+            ner.reload()
+        except Exception:
+            return jsonify(ner.reload_status), 500
+        return jsonify(ner.reload_status)
+    
+    # Un rechargement déjà en cours n'est pas relancé : son état est retourné
+    ner.reload_async()
+    return jsonify(ner.reload_status), 202
+
+@app.route('/api/reload-gazetteers', methods=['GET'])
+def reload_gazetteers_status():
+    """Résultat du dernier rechargement des gazetteers (erreur comprise)"""
+    return jsonify(ner.reload_status)
+
 @app.route('/api/text-to-speech', methods=['POST'])
 def text_to_speech():
     """Génère l'audio du texte"""
@@ -93,6 +301,35 @@ def text_to_speech():
     audio_url = tts.generate(text)
     return jsonify({'audio_url': audio_url})
 
+@app.route('/api/tts-cache-stats', methods=['GET'])
+def tts_cache_stats():
+    """Statistiques du cache audio de la synthèse vocale"""
+    return jsonify(tts.cache_stats())
+
+@app.route('/api/text-to-speech/jobs', methods=['POST'])
+def submit_text_to_speech():
+    """Soumet une synthèse vocale ; retourne immédiatement l'id du travail"""
+    data = request.get_json()
+    text = data.get('text', '')
+    
+    if not text.strip():
+        return jsonify({'error': 'empty_text'}), 400
+    
+    job = tts_jobs.submit(text)
+    if job is None:
+        return jsonify({'error': 'queue_full'}), 429
+    return jsonify(job.to_dict()), 202
+
+@app.route('/api/text-to-speech/jobs/<job_id>', methods=['GET'])
+def text_to_speech_job(job_id):
+    """Statut d'un travail de synthèse ; ?wait=N attend jusqu'à N secondes"""
+    timeout = min(request.args.get('wait', 0, type=float), 30)
+    
+    job = tts_jobs.wait(job_id, timeout) if timeout > 0 else tts_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'unknown_job'}), 404
+    return jsonify(job.to_dict())
+
 @app.route('/api/validate-phonetics', methods=['POST'])
 def validate_phonetics():
     """Valide les règles phonotactiques malagasy"""
@@ -105,5 +342,14 @@ def validate_phonetics():
         'errors': errors
     })
 
+@app.route('/api/scan-phonetics', methods=['POST'])
+def scan_phonetics():
+    """Trouve les violations phonotactiques de tout un texte"""
+    data = request.get_json()
+    text = data.get('text', '')
+    
+    violations = spell_checker.scan_phonetics(text)
+    return jsonify({'violations': violations})
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
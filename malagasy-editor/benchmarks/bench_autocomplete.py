@@ -0,0 +1,82 @@
+"""
+Benchmark de la prédiction du mot suivant
+Compare l'ancien parcours du modèle avec eval() à l'index par tuple
+
+Usage:
+    python -m benchmarks.bench_autocomplete --contexts 1000000 2000000
+"""
+import argparse
+import random
+import time
+
+from benchmarks.common import generate_words, timed
+from modules.autocomplete import AutoComplete
+
+
+def build_model(contexts, vocabulary, rng):
+    """Génère un modèle {clé JSON: {mot: fréquence}} de taille donnée"""
+    model = {}
+    while len(model) < contexts:
+        order = rng.choice([1, 2])
+        context = tuple(rng.choice(vocabulary) for _ in range(order))
+        key = '(' + ', '.join(f'"{word}"' for word in context) + (',)' if order == 1 else ')')
+        model[key] = {rng.choice(vocabulary): rng.randint(1, 100) for _ in range(5)}
+    return model
+
+
+def eval_scan(ngrams, context_key):
+    """Ancien AutoComplete._find_predictions : eval() de chaque clé"""
+    for key, value in ngrams.items():
+        try:
+            key_tuple = eval(key)
+        except Exception:
+            continue
+        if key_tuple == context_key:
+            return value
+    return {}
+
+
+def run(contexts, queries, scan_queries, seed):
+    rng = random.Random(seed)
+    vocabulary = generate_words(50000, seed=seed)
+    model = build_model(contexts, vocabulary, rng)
+    keys = list(model)
+    samples = [' '.join(eval(rng.choice(keys))) for _ in range(queries)]
+
+    autocomplete = AutoComplete.__new__(AutoComplete)
+    autocomplete.n = 3
+    autocomplete.top_k = 10
+    autocomplete._load_ngrams = lambda: model
+    autocomplete._load_word_frequencies = lambda: {}
+    _, load_time = timed(AutoComplete.__init__, autocomplete, 3, 10)
+
+    start = time.perf_counter()
+    for sample in samples:
+        autocomplete.predict_next_word(sample)
+    indexed_time = (time.perf_counter() - start) / queries
+
+    start = time.perf_counter()
+    for sample in samples[:scan_queries]:
+        eval_scan(model, tuple(autocomplete._tokenize(sample)[-2:]))
+    scan_time = (time.perf_counter() - start) / scan_queries
+
+    print(f"{contexts:>9} contextes | indexation {load_time:6.2f} s | "
+          f"parcours eval() {scan_time * 1000:10.1f} ms/requête | "
+          f"index {indexed_time * 1e6:6.2f} µs/requête")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--contexts', type=int, nargs='+', default=[1000000, 2000000])
+    parser.add_argument('--queries', type=int, default=10000)
+    parser.add_argument('--scan-queries', type=int, default=3,
+                        help="requêtes mesurées sur l'ancien parcours (très lent)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for contexts in args.contexts:
+        run(contexts, args.queries, args.scan_queries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
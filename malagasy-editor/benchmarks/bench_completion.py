@@ -0,0 +1,52 @@
+"""
+Benchmark de la complétion du mot en cours de saisie
+Mesure la construction, la mémoire et la latence du trie de préfixes
+
+Usage:
+    python -m benchmarks.bench_completion --sizes 100000 500000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from benchmarks.common import generate_words, timed
+from modules.prefix_trie import PrefixTrie
+
+
+def run(size, queries, seed):
+    rng = random.Random(seed)
+    words = generate_words(size, seed=seed)
+    frequencies = {word: int(rng.paretovariate(1.2)) for word in words}
+
+    tracemalloc.start()
+    trie, build_time = timed(PrefixTrie, frequencies)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples = [rng.choice(words) for _ in range(queries)]
+    results = []
+    for length in (1, 2, 4, 6):
+        prefixes = [word[:length] for word in samples]
+        start = time.perf_counter()
+        for prefix in prefixes:
+            trie.complete(prefix, 5)
+        results.append(f"{length} car. {(time.perf_counter() - start) / queries * 1e6:5.2f} µs")
+
+    print(f"{size:>8} mots | construction {build_time:5.2f} s | "
+          f"mémoire {memory / 1024 / 1024:6.1f} Mo | " + ' | '.join(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 500000])
+    parser.add_argument('--queries', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.queries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
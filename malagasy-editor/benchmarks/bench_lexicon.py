@@ -0,0 +1,70 @@
+"""
+Benchmark du lexique compact face au set Python
+Mesure la mémoire occupée et la latence des recherches
+
+Usage:
+    python -m benchmarks.bench_lexicon --sizes 100000 1000000
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from benchmarks.common import generate_words, misspell
+from modules.lexicon import CompactLexicon
+
+
+def measure_memory(build, words):
+    """Mémoire allouée (en Mo) par la structure construite"""
+    gc.collect()
+    tracemalloc.start()
+    structure = build(words)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return structure, current / 1024 / 1024
+
+
+def latency(structure, queries):
+    """Latence moyenne d'un test d'appartenance (en microsecondes)"""
+    start = time.perf_counter()
+    for query in queries:
+        query in structure
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def run(size, queries, seed):
+    rng = random.Random(seed)
+    # Les chaînes sont recréées pour que le set en possède sa propre copie
+    words = [word.encode().decode() for word in generate_words(size, seed=seed)]
+    hits = [rng.choice(words) for _ in range(queries)]
+    misses = [misspell(word, rng) for word in hits]
+
+    word_set, set_memory = measure_memory(lambda w: set(s.encode().decode() for s in w), words)
+    lexicon, lexicon_memory = measure_memory(CompactLexicon, words)
+
+    start = time.perf_counter()
+    for word in hits[:1000]:
+        lexicon.prefix(word[:3], limit=10)
+    prefix_time = (time.perf_counter() - start) / min(len(hits), 1000) * 1e6
+
+    print(f"{size:>9} mots | mémoire set {set_memory:7.1f} Mo, compact {lexicon_memory:6.1f} Mo "
+          f"({lexicon_memory / set_memory:.0%}) | "
+          f"appartenance set {latency(word_set, hits):.2f}/{latency(word_set, misses):.2f} µs, "
+          f"compact {latency(lexicon, hits):.2f}/{latency(lexicon, misses):.2f} µs (présent/absent) | "
+          f"préfixe (10 mots) {prefix_time:.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--queries', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.queries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
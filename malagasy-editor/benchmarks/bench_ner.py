@@ -0,0 +1,95 @@
+"""
+Benchmark de l'extraction d'entités nommées
+Compare l'ancienne recherche (une regex par entité) à l'automate unique
+
+Usage:
+    python -m benchmarks.bench_ner --entries 100000 --text-kb 50
+"""
+import argparse
+import random
+import re
+import time
+
+from benchmarks.common import generate_words, timed
+from modules.gazetteer import Gazetteer
+from modules.ner import NamedEntityRecognizer
+
+
+def build_gazetteer(entries, rng):
+    """Génère `entries` noms d'une à trois formes (ex. 'nosy be', 'rakoto frah')"""
+    words = generate_words(entries, seed=rng.randrange(1 << 30))
+    gazetteer = {}
+    for word in words:
+        size = rng.choice([1, 1, 1, 2, 2, 3])
+        name = ' '.join([word] + rng.sample(words, size - 1))
+        gazetteer[name] = {'type': 'ville'}
+    return gazetteer
+
+
+def build_text(gazetteer, size, rng):
+    """Texte d'environ `size` caractères dont un mot sur dix est une entité"""
+    names = list(gazetteer)
+    filler = generate_words(2000, seed=rng.randrange(1 << 30))
+    parts = []
+    length = 0
+    while length < size:
+        part = rng.choice(names) if rng.random() < 0.1 else rng.choice(filler)
+        parts.append(part.capitalize())
+        length += len(part) + 1
+    return ' '.join(parts)
+
+
+def regex_extract(gazetteer, text):
+    """Ancien NamedEntityRecognizer.extract : une regex compilée par entité"""
+    text_lower = text.lower()
+    entities = []
+    for name in gazetteer:
+        pattern = r'\b' + re.escape(name) + r'\b'
+        for match in re.finditer(pattern, text_lower):
+            entities.append((match.start(), match.end(), name))
+    entities.sort()
+    return entities
+
+
+def run(entries, text_kb, regex_entries, seed):
+    rng = random.Random(seed)
+    gazetteer = build_gazetteer(entries, rng)
+    text = build_text(gazetteer, text_kb * 1024, rng)
+
+    def build():
+        entries = Gazetteer()
+        for name, info in gazetteer.items():
+            entries.add(name, 'VILLE', info)
+        return entries, entries.build_matcher()
+
+    ner = NamedEntityRecognizer.__new__(NamedEntityRecognizer)
+    ner._snapshot, build_time = timed(build)
+
+    entities, extract_time = timed(ner.extract, text)
+
+    # L'ancienne méthode est mesurée sur un échantillon puis extrapolée
+    sample = dict(rng.sample(list(gazetteer.items()), min(regex_entries, entries)))
+    start = time.perf_counter()
+    regex_extract(sample, text)
+    regex_time = (time.perf_counter() - start) * entries / len(sample)
+
+    print(f"{entries:>7} entrées, texte {len(text) // 1024} Ko | "
+          f"construction {build_time:5.2f} s | automate {extract_time * 1000:7.1f} ms "
+          f"({len(entities)} entités) | regex par entité ~{regex_time:7.1f} s (extrapolé)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--entries', type=int, nargs='+', default=[100000])
+    parser.add_argument('--text-kb', type=int, default=50)
+    parser.add_argument('--regex-entries', type=int, default=1000,
+                        help="entrées mesurées avec l'ancienne méthode (très lente)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for entries in args.entries:
+        run(entries, args.text_kb, args.regex_entries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark de l'analyse de sentiment
+Compare la boucle Python token par token au calcul vectorisé (NumPy)
+
+Usage:
+    python -m benchmarks.bench_sentiment --tokens 1000 100000 1000000
+"""
+import argparse
+import random
+
+from benchmarks.common import generate_words, timed
+from modules.sentiment_analyzer import SentimentAnalyzer
+
+
+def build_text(analyzer, tokens, rng):
+    """Texte synthétique : environ 20 % de mots du lexique, négations et intensificateurs"""
+    lexicon = [word for word in analyzer.positive_words | analyzer.negative_words
+               if ' ' not in word]
+    markers = analyzer.negations + analyzer.intensifiers
+    filler = generate_words(5000, seed=rng.randrange(1 << 30))
+
+    words = []
+    for _ in range(tokens):
+        roll = rng.random()
+        if roll < 0.15:
+            words.append(rng.choice(lexicon))
+        elif roll < 0.25:
+            words.append(rng.choice(markers))
+        else:
+            words.append(rng.choice(filler))
+    return ' '.join(words)
+
+
+def run(tokens, repeat, seed):
+    rng = random.Random(seed)
+    analyzer = SentimentAnalyzer()
+    text = build_text(analyzer, tokens, rng)
+    words = analyzer._tokenize(text)
+
+    loop_time = vector_time = 0
+    for _ in range(repeat):
+        (positive, negative, _), elapsed = timed(analyzer._score_tokens, words)
+        loop_time += elapsed
+        (vector_positive, vector_negative), elapsed = timed(analyzer._score_vectorized, words)
+        vector_time += elapsed
+
+    assert (positive, negative) == (vector_positive, vector_negative)
+
+    print(f"{tokens:>9} tokens | boucle {loop_time / repeat * 1000:9.2f} ms | "
+          f"vectorisé {vector_time / repeat * 1000:9.2f} ms | "
+          f"x{loop_time / vector_time:5.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tokens', type=int, nargs='+', default=[1000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for tokens in args.tokens:
+        run(tokens, args.repeat, args.seed)
+
+
+if __name__ == '__main__':
+    main()
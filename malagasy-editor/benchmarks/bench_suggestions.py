@@ -0,0 +1,63 @@
+"""
+Benchmark des moteurs de suggestions orthographiques
+Compare rapidfuzz.process.extract (parcours complet) à l'index SymSpell
+
+Usage:
+    python -m benchmarks.bench_suggestions --sizes 10000 100000 1000000
+"""
+import argparse
+import random
+
+from rapidfuzz import fuzz, process
+
+from benchmarks.common import generate_words, misspell, timed
+from modules.symspell import SymSpellIndex
+
+
+def extract_suggestions(word, dictionary, limit=5, min_score=70):
+    """Chemin actuel de SpellChecker._get_suggestions"""
+    results = process.extract(word, dictionary, scorer=fuzz.ratio, limit=limit)
+    return [match[0] for match in results if match[1] >= min_score]
+
+
+def run(size, queries, seed):
+    rng = random.Random(seed)
+    words = generate_words(size, seed=seed)
+    dictionary = set(words)
+    samples = [misspell(rng.choice(words), rng) for _ in range(queries)]
+
+    index, build_time = timed(SymSpellIndex, dictionary)
+
+    _, extract_time = timed(
+        lambda: [extract_suggestions(w, dictionary) for w in samples]
+    )
+    symspell_results, symspell_time = timed(
+        lambda: [index.lookup(w, min_score=70) for w in samples]
+    )
+
+    # Part des requêtes pour lesquelles la meilleure suggestion est identique
+    agreement = sum(
+        1 for w, result in zip(samples, symspell_results)
+        if result[:1] == extract_suggestions(w, dictionary)[:1]
+    ) / len(samples)
+
+    print(f"{size:>9} mots | construction SymSpell {build_time:7.2f} s | "
+          f"extract {extract_time / queries * 1000:8.3f} ms/mot | "
+          f"symspell {symspell_time / queries * 1000:7.3f} ms/mot | "
+          f"accord top-1 {agreement:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10000, 100000, 1000000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        run(size, args.queries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
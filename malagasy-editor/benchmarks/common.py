@@ -0,0 +1,47 @@
+"""
+Outils communs aux benchmarks
+Génère des lexiques synthétiques à la phonotactique malagasy (syllabes CV)
+"""
+import random
+import time
+
+CONSONANTS = ['b', 'd', 'f', 'g', 'h', 'j', 'k', 'l', 'm', 'n', 'p',
+              'r', 's', 't', 'v', 'z', 'ts', 'tr', 'dr', 'nt', 'mb', 'ng']
+VOWELS = ['a', 'e', 'i', 'o', 'y']
+PREFIXES = ['', '', 'mi', 'ma', 'man', 'mam', 'maha', 'mpan', 'fi', 'fan']
+SUFFIXES = ['', '', '', 'ana', 'ina', 'na']
+
+
+def generate_words(count, seed=42):
+    """Génère `count` mots uniques ressemblant à des formes malagasy"""
+    rng = random.Random(seed)
+    words = set()
+
+    while len(words) < count:
+        syllables = rng.randint(2, 4)
+        root = ''.join(
+            rng.choice(CONSONANTS) + rng.choice(VOWELS)
+            for _ in range(syllables)
+        )
+        words.add(rng.choice(PREFIXES) + root + rng.choice(SUFFIXES))
+
+    return sorted(words)
+
+
+def misspell(word, rng):
+    """Introduit une faute de frappe (substitution, suppression ou insertion)"""
+    i = rng.randrange(len(word))
+    operation = rng.choice(['sub', 'del', 'ins'])
+
+    if operation == 'sub':
+        return word[:i] + rng.choice(VOWELS) + word[i + 1:]
+    if operation == 'del' and len(word) > 2:
+        return word[:i] + word[i + 1:]
+    return word[:i] + rng.choice(VOWELS) + word[i:]
+
+
+def timed(func, *args, **kwargs):
+    """Exécute func et retourne (résultat, durée en secondes)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -4,18 +4,77 @@ Prédit le mot suivant basé sur le contexte
 """
 import json
 import os
-from collections import defaultdict, Counter
 import re
+from modules.prefix_trie import PrefixTrie
+from modules.ngram_store import NgramIndex, load_model
+
+
+def tokenize(text):
+    """Tokenise le texte en mots (en minuscules)"""
+    text = text.lower().strip()
+    return re.findall(r'\b\w+\b', text)
+
 
 class AutoComplete:
-    def __init__(self, n=3):
+    def __init__(self, n=3, top_k=10, model_path=None):
         """
         Initialise le module d'autocomplétion
         n: taille du n-gram (par défaut trigram)
+        top_k: nombre de prédictions précalculées par contexte
+        model_path: modèle JSON ou binaire (par défaut data/ngrams.bin
+            s'il existe, sinon data/ngrams.json)
         """
         self.n = n
-        self.ngrams = self._load_ngrams()
+        self.top_k = top_k
+        self.ngrams = self._load_model(model_path)
         self.word_freq = self._load_word_frequencies()
+        
+        # Mots les plus fréquents, triés une seule fois
+        self._most_frequent = self._top_words(self.word_freq)
+        
+        # Trie des complétions du mot en cours de saisie
+        self.prefix_trie = PrefixTrie(self.word_freq, k=top_k)
+        
+        # Apprentissage en ligne (voir set_learner)
+        self.learner = None
+    
+    def set_learner(self, learner):
+        """
+        Active l'apprentissage en ligne : les prédictions consultent
+        d'abord le dernier instantané publié par le learner
+        """
+        self.learner = learner
+    
+    def learn(self, text):
+        """Ajoute un texte aux comptes appris (si l'apprentissage est actif)"""
+        if self.learner is not None:
+            self.learner.learn(text)
+    
+    def learn_accepted(self, context, word):
+        """Ajoute une suggestion acceptée aux comptes appris"""
+        if self.learner is not None:
+            self.learner.learn_accepted(context, word)
+    
+    def _load_model(self, model_path):
+        """Ouvre le modèle N-grams (index en mémoire ou binaire mmap)"""
+        if model_path is None:
+            binary_path = os.path.join('data', 'ngrams.bin')
+            if os.path.exists(binary_path):
+                model_path = binary_path
+        
+        if model_path is not None:
+            return load_model(model_path, self.top_k)
+        
+        return NgramIndex(self._load_ngrams(), self.top_k)
+    
+    def _top_words(self, counts):
+        """Retourne les top_k mots d'un dictionnaire {mot: fréquence}"""
+        sorted_words = sorted(
+            counts.items(),
+            key=lambda x: x[1],
+            reverse=True
+        )
+        return tuple(word for word, _ in sorted_words[:self.top_k])
     
     def _load_ngrams(self):
         """Charge le modèle n-gram pré-calculé"""
@@ -77,6 +136,13 @@ class AutoComplete:
         # Tokeniser et nettoyer le contexte
         tokens = self._tokenize(context)
         
+        return self.predict_from_tokens(tokens, max_suggestions)
+    
+    def predict_from_tokens(self, tokens, max_suggestions=5):
+        """
+        Prédit les mots suivants à partir de tokens déjà extraits
+        (utilisé par les sessions qui gardent leur fenêtre de tokens)
+        """
         if not tokens:
             return self._get_most_frequent_words(max_suggestions)
         
@@ -84,59 +150,67 @@ class AutoComplete:
         context_key = tuple(tokens[-(self.n-1):])
         
         # Chercher les correspondances exactes
-        predictions = self._find_predictions(context_key)
+        predictions = self._lookup(context_key, max_suggestions)
         
         # Si pas de correspondance exacte, essayer avec moins de contexte
         if not predictions and len(context_key) > 1:
             context_key = tuple(tokens[-1:])
-            predictions = self._find_predictions(context_key)
+            predictions = self._lookup(context_key, max_suggestions)
         
         # Si toujours pas de prédiction, retourner les mots les plus fréquents
         if not predictions:
             return self._get_most_frequent_words(max_suggestions)
         
-        # Trier par fréquence et retourner
-        sorted_predictions = sorted(
-            predictions.items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )
+        # Prédictions déjà triées par fréquence
+        return list(predictions)
+    
+    def complete_word(self, prefix, max_suggestions=5):
+        """
+        Complète le mot en cours de saisie
+        
+        Args:
+            prefix: début du mot (ex: 'mian')
+            max_suggestions: nombre maximum de suggestions
         
-        return [word for word, _ in sorted_predictions[:max_suggestions]]
+        Returns:
+            mots les plus fréquents commençant par le préfixe
+        """
+        prefix = prefix.lower().strip()
+        if not prefix:
+            return []
+        
+        return self.prefix_trie.complete(prefix, max_suggestions)
+    
+    def complete_current_word(self, context, max_suggestions=5):
+        """
+        Complète le dernier mot du contexte s'il est en cours de saisie
+        
+        Returns:
+            (préfixe complété, suggestions) ; préfixe vide si le contexte
+            se termine par un espace ou une ponctuation
+        """
+        match = re.search(r'\w+$', context)
+        if not match:
+            return '', []
+        
+        prefix = match.group()
+        return prefix, self.complete_word(prefix, max_suggestions)
+    
+    def _lookup(self, context_key, limit):
+        """Prédictions d'un contexte : instantané appris, sinon modèle de base"""
+        if self.learner is not None:
+            learned = self.learner.snapshot.predictions.get(context_key)
+            if learned:
+                return learned[:limit]
+        
+        return self.ngrams.predictions(context_key, limit)
     
     def _tokenize(self, text):
         """Tokenise le texte en mots"""
-        # Nettoyer et tokeniser
-        text = text.lower().strip()
-        tokens = re.findall(r'\b\w+\b', text)
-        return tokens
-    
-    def _find_predictions(self, context_key):
-        """Trouve les prédictions pour une clé de contexte"""
-        # Convertir le tuple en chaîne pour la recherche JSON
-        key_str = str(context_key)
-        
-        # Chercher dans le dictionnaire
-        for key, value in self.ngrams.items():
-            if isinstance(key, str):
-                # Convertir la clé string en tuple pour comparaison
-                try:
-                    key_tuple = eval(key)
-                except:
-                    continue
-            else:
-                key_tuple = key
-            
-            if key_tuple == context_key:
-                return value
-        
-        return {}
+        return tokenize(text)
     
     def _get_most_frequent_words(self, limit):
         """Retourne les mots les plus fréquents"""
-        sorted_words = sorted(
-            self.word_freq.items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )
-        return [word for word, _ in sorted_words[:limit]]
+        if self.learner is not None:
+            return list(self.learner.snapshot.most_frequent[:limit])
+        return list(self._most_frequent[:limit])
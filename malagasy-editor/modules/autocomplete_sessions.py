@@ -0,0 +1,118 @@
+"""
+Sessions d'autocomplétion
+Le serveur garde la fenêtre glissante des derniers tokens de chaque
+éditeur : le client n'envoie que le texte ajouté depuis le dernier appel
+"""
+import re
+import threading
+import uuid
+from collections import deque
+
+from modules.cache import LRUCache
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class AutoCompleteSession:
+    def __init__(self, window_size):
+        """
+        Initialise une session vide
+
+        Args:
+            window_size: nombre de tokens complets gardés (n-1)
+        """
+        self.tokens = deque(maxlen=window_size)
+        # Mot en cours de saisie (fin du texte sans séparateur)
+        self.partial = ''
+        self._lock = threading.Lock()
+
+    def append(self, delta):
+        """Ajoute le texte saisi depuis le dernier appel"""
+        with self._lock:
+            text = self.partial + delta.lower()
+            self.partial = ''
+
+            words = WORD_PATTERN.findall(text)
+            if words and WORD_PATTERN.fullmatch(text[-1]):
+                # Le dernier mot n'est pas terminé : le garder à part
+                self.partial = words.pop()
+
+            self.tokens.extend(words)
+
+    def reset(self, context):
+        """Réinitialise la session avec un contexte complet"""
+        with self._lock:
+            self.tokens.clear()
+            self.partial = ''
+        self.append(context)
+
+    def context_tokens(self):
+        """
+        Tokens du contexte, mot en cours compris
+        (identiques aux derniers tokens de AutoComplete._tokenize)
+        """
+        with self._lock:
+            tokens = list(self.tokens)
+            if self.partial:
+                tokens.append(self.partial)
+            return tokens
+
+
+class AutoCompleteSessions:
+    def __init__(self, autocomplete, max_sessions=10000):
+        """
+        Initialise le gestionnaire de sessions
+
+        Args:
+            autocomplete: instance AutoComplete utilisée pour les prédictions
+            max_sessions: nombre de sessions gardées (les plus anciennes
+                sont évincées ; le client recrée alors sa session)
+        """
+        self.autocomplete = autocomplete
+        self._sessions = LRUCache(max_sessions)
+
+    def create(self, context=''):
+        """
+        Crée une session initialisée avec le contexte
+
+        Returns:
+            dictionnaire avec l'id de la session et les premières suggestions
+        """
+        session_id = uuid.uuid4().hex
+        session = AutoCompleteSession(self.autocomplete.n - 1)
+        session.append(context)
+        self._sessions.put(session_id, session)
+        return {'session_id': session_id, **self.suggest(session)}
+
+    def update(self, session_id, delta):
+        """
+        Ajoute un delta à une session et retourne les suggestions
+
+        Returns:
+            dictionnaire de suggestions, ou None si la session est inconnue
+        """
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+
+        session.append(delta)
+        return self.suggest(session)
+
+    def suggest(self, session, max_suggestions=5):
+        """Suggestions d'une session : mot suivant, ou complétion du mot en cours"""
+        tokens = session.context_tokens()
+        prefix = session.partial
+
+        return {
+            'suggestions': self.autocomplete.predict_from_tokens(tokens, max_suggestions),
+            'prefix': prefix,
+            'completions': self.autocomplete.complete_word(prefix, max_suggestions)
+        }
+
+    def get(self, session_id):
+        """Retourne la session, ou None si elle a expiré"""
+        return self._sessions.get(session_id)
+
+    def close(self, session_id):
+        """Supprime une session"""
+        self._sessions.pop(session_id)
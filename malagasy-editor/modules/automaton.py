@@ -0,0 +1,124 @@
+"""
+Automate d'Aho-Corasick
+Trouve toutes les occurrences d'un ensemble de motifs en une seule passe
+linéaire ; les symboles sont des caractères (chaîne) ou des tokens (liste)
+"""
+from collections import deque
+
+
+class AhoCorasick:
+    def __init__(self, patterns=None):
+        """
+        Initialise l'automate
+
+        Args:
+            patterns: itérable optionnel de couples (séquence, valeur) ;
+                l'automate est alors construit immédiatement
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        # (longueur du motif, valeur) du motif se terminant sur le nœud
+        self._output = [None]
+        # Nœud suffixe le plus proche portant un motif (-1 si aucun)
+        self._output_link = [-1]
+        self._size = 0
+
+        if patterns is not None:
+            for sequence, value in patterns:
+                self.add(sequence, value)
+            self.build()
+
+    def add(self, sequence, value):
+        """Ajoute un motif ; build() doit être appelé avant la recherche"""
+        if not sequence:
+            return
+
+        node = 0
+        for symbol in sequence:
+            child = self._goto[node].get(symbol)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][symbol] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._output_link.append(-1)
+            node = child
+
+        if self._output[node] is None:
+            self._size += 1
+        self._output[node] = (len(sequence), value)
+
+    def build(self):
+        """Calcule les liens d'échec (parcours en largeur)"""
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            self._fail[child] = 0
+
+        while queue:
+            node = queue.popleft()
+            for symbol, child in self._goto[node].items():
+                state = self._fail[node]
+                while state and symbol not in self._goto[state]:
+                    state = self._fail[state]
+                fail = self._goto[state].get(symbol, 0)
+                self._fail[child] = fail
+
+                self._output_link[child] = (
+                    fail if self._output[fail] is not None else self._output_link[fail]
+                )
+                queue.append(child)
+
+    def iter_matches(self, sequence):
+        """
+        Itère sur toutes les occurrences (chevauchements compris)
+
+        Yields:
+            (début, fin, valeur) en indices de la séquence
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        output_link = self._output_link
+        state = 0
+
+        for i, symbol in enumerate(sequence):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+
+            node = state if output[state] is not None else output_link[state]
+            while node > 0:
+                length, value = output[node]
+                yield i + 1 - length, i + 1, value
+                node = output_link[node]
+
+    def longest_matches(self, sequence, accept=None):
+        """
+        Occurrences sans chevauchement, la plus longue l'emportant
+        (sélection gloutonne de gauche à droite)
+
+        Args:
+            accept: fonction optionnelle (début, fin) -> bool filtrant les
+                occurrences (ex. limites de mots)
+
+        Returns:
+            liste de (début, fin, valeur) triée par position
+        """
+        matches = [
+            match for match in self.iter_matches(sequence)
+            if accept is None or accept(match[0], match[1])
+        ]
+        matches.sort(key=lambda match: (match[0], -match[1]))
+
+        selected = []
+        position = 0
+        for start, end, value in matches:
+            if start >= position:
+                selected.append((start, end, value))
+                position = end
+
+        return selected
+
+    def __len__(self):
+        return self._size
@@ -0,0 +1,94 @@
+"""
+Cache LRU borné et thread-safe
+Partagé par les modules qui mémorisent des résultats coûteux
+"""
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, maxsize=4096):
+        """
+        Initialise le cache
+
+        Args:
+            maxsize: nombre maximum d'entrées (0 désactive le cache)
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Incrémentée à chaque invalidation : un résultat calculé avant
+        # un clear() ne doit pas être réinséré après
+        self.generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Retourne la valeur associée à key (et la marque comme récente)"""
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, generation=None):
+        """
+        Ajoute une entrée, en évinçant la moins récemment utilisée si besoin
+
+        Args:
+            generation: génération lue avant le calcul de value ; l'entrée
+                est ignorée si le cache a été invalidé entre-temps
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Retire une entrée du cache et la retourne"""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        """Vide le cache (les compteurs sont conservés)"""
+        with self._lock:
+            self._data.clear()
+            self.generation += 1
+
+    def stats(self):
+        """Retourne les compteurs d'utilisation du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
@@ -0,0 +1,136 @@
+"""
+Gazetteers de la reconnaissance d'entités nommées
+Stockage compact d'un grand nombre d'entrées : noms internés, types et
+métadonnées partagés dans des tables, alias résolus par un index
+
+Format des fichiers (JSONL, une entrée par ligne) :
+    {"name": "toamasina", "type": "VILLE", "aliases": ["tamatave"], "info": {"region": "Atsinanana"}}
+"""
+import json
+import sys
+from array import array
+
+from modules.automaton import AhoCorasick
+
+
+class Gazetteer:
+    def __init__(self):
+        """Initialise un gazetteer vide"""
+        # Nom canonique de chaque entrée (chaînes internées)
+        self.names = []
+        # Par entrée : indice dans type_table et dans info_table
+        self._type_ids = array('H')
+        self._info_ids = array('I')
+
+        # Tables partagées : une seule copie de chaque type et de chaque
+        # dictionnaire de métadonnées identique
+        self.type_table = []
+        self.info_table = []
+        self._type_index = {}
+        self._info_index = {}
+
+        # Nom canonique -> première entrée ; alias -> entrée canonique
+        self.index = {}
+        self.aliases = {}
+        # Entrées portant un nom déjà utilisé (ex. même nom dans deux types)
+        self._homonyms = {}
+
+    def add(self, name, entity_type, info=None, aliases=()):
+        """
+        Ajoute une entrée
+
+        Args:
+            name: nom canonique
+            entity_type: type d'entité ('VILLE', 'REGION'...)
+            info: métadonnées de l'entrée
+            aliases: autres noms renvoyant à cette entrée ('tamatave')
+
+        Returns:
+            indice de l'entrée
+        """
+        name = sys.intern(name.lower().strip())
+        position = len(self.names)
+
+        self.names.append(name)
+        self._type_ids.append(self._intern(entity_type, self.type_table, self._type_index))
+        info = info or {}
+        info_key = json.dumps(info, sort_keys=True, ensure_ascii=False)
+        self._info_ids.append(self._intern(info, self.info_table, self._info_index, info_key))
+
+        if name in self.index:
+            self._homonyms.setdefault(name, []).append(position)
+        else:
+            self.index[name] = position
+
+        for alias in aliases:
+            alias = sys.intern(alias.lower().strip())
+            if alias and alias != name:
+                self.aliases.setdefault(alias, position)
+
+        return position
+
+    def _intern(self, value, table, index, key=None):
+        """Indice de `value` dans une table partagée (ajoutée si absente)"""
+        key = value if key is None else key
+        position = index.get(key)
+        if position is None:
+            position = len(table)
+            table.append(value)
+            index[key] = position
+        return position
+
+    def entry(self, position):
+        """Retourne (type, nom canonique, métadonnées) d'une entrée"""
+        return (
+            self.type_table[self._type_ids[position]],
+            self.names[position],
+            self.info_table[self._info_ids[position]]
+        )
+
+    def lookup(self, name):
+        """Entrée correspondant à un nom ou à un alias, ou None"""
+        name = name.lower().strip()
+        position = self.index.get(name)
+        if position is None:
+            position = self.aliases.get(name)
+        return None if position is None else self.entry(position)
+
+    def build_matcher(self):
+        """
+        Compile les noms et les alias en un automate sur les caractères ;
+        chaque forme renvoie au tuple des entrées qu'elle désigne
+        """
+        forms = {}
+        for name, position in self.index.items():
+            forms[name] = [position] + self._homonyms.get(name, [])
+        for alias, position in self.aliases.items():
+            forms.setdefault(alias, []).append(position)
+
+        return AhoCorasick((form, tuple(positions)) for form, positions in forms.items())
+
+    @classmethod
+    def load(cls, paths):
+        """
+        Charge un gazetteer depuis des fichiers JSONL
+
+        Raises:
+            OSError: fichier illisible
+            ValueError: ligne invalide (le fichier et la ligne sont indiqués)
+        """
+        gazetteer = cls()
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        row = json.loads(line)
+                        gazetteer.add(row['name'], row['type'], row.get('info'),
+                                      row.get('aliases', ()))
+                    except (ValueError, KeyError, TypeError, AttributeError, OverflowError) as e:
+                        raise ValueError(f"{path}:{line_number}: entrée invalide ({e!r})") from e
+        return gazetteer
+
+    def __len__(self):
+        return len(self.names)
@@ -1,12 +1,63 @@
 """
 Module de lemmatisation pour le Malagasy
 Trouve la racine d'un mot en retirant les préfixes et suffixes
+
+Usage (précalcul de la table forme -> analyse du dictionnaire):
+    python -m modules.lemmatizer data/dictionary.json data/lemmas.json
 """
+import hashlib
+import json
+import os
 import re
+import sys
+
+from modules.cache import LRUCache
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class AffixTrie:
+    def __init__(self, affixes, reverse=False):
+        """
+        Trie des affixes ; chaque affixe garde son rang dans la liste
+        d'origine pour reproduire la règle « premier affixe de la liste »
+        
+        Args:
+            affixes: liste ordonnée des affixes
+            reverse: True pour des suffixes (le mot est parcouru depuis la fin)
+        """
+        self.reverse = reverse
+        self.root = {}
+        for rank, affix in enumerate(affixes):
+            node = self.root
+            for char in (reversed(affix) if reverse else affix):
+                node = node.setdefault(char, {})
+            # La clé None marque la fin d'un affixe
+            node.setdefault(None, (rank, affix))
+    
+    def matches(self, word):
+        """Liste des (rang, affixe) qui commencent (ou terminent) le mot"""
+        found = []
+        node = self.root
+        for char in (reversed(word) if self.reverse else word):
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                found.append(node[None])
+        return found
+
 
 class Lemmatizer:
-    def __init__(self):
-        """Initialise le lemmatiseur"""
+    def __init__(self, memo_size=65536, table_path=None):
+        """
+        Initialise le lemmatiseur
+        
+        Args:
+            memo_size: nombre d'analyses de mots inconnus gardées en cache
+            table_path: table forme -> analyse précalculée (par défaut
+                data/lemmas.json, sinon calculée depuis le dictionnaire)
+        """
         # Préfixes courants (ordonnés du plus long au plus court)
         self.prefixes = [
             'maha', 'mpam', 'mpan', 'mam', 'man', 'fam', 'fan', 'mi', 'ma', 'fi', 'f'
@@ -28,6 +79,65 @@ class Lemmatizer:
             'manao': 'vita',
             'manosika': 'tosika'
         }
+        
+        # Alternances de fin de racine devant un suffixe
+        # (mianatra / fianarana : 'tr' devient 'r')
+        self.root_alternations = {'r': 'tr', 'h': 'k'}
+        
+        self._prefix_trie = AffixTrie(self.prefixes)
+        self._suffix_trie = AffixTrie(self.suffixes, reverse=True)
+        self._memo = LRUCache(memo_size)
+        
+        # Analyses des formes du lexique : (lemme, préfixe, suffixe, type)
+        self.table = self._load_table(table_path or os.path.join('data', 'lemmas.json'))
+    
+    def _rules_key(self):
+        """Empreinte des règles : une table calculée avec d'autres règles est ignorée"""
+        rules = json.dumps([self.prefixes, self.suffixes, self.irregular_verbs],
+                           sort_keys=True, ensure_ascii=False)
+        return hashlib.md5(rules.encode('utf-8')).hexdigest()
+    
+    def _load_table(self, path):
+        """Charge la table précalculée, ou la calcule depuis le dictionnaire"""
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('rules') == self._rules_key():
+                    return {form: tuple(entry) for form, entry in data['forms'].items()}
+            except (OSError, ValueError) as e:
+                print(f"Erreur chargement table des lemmes: {e}")
+        
+        return self.build_table(self.load_lexicon())
+    
+    def load_lexicon(self):
+        """Formes connues : dictionnaire et verbes irréguliers"""
+        forms = list(self.irregular_verbs)
+        dict_path = os.path.join('data', 'dictionary.json')
+        if os.path.exists(dict_path):
+            with open(dict_path, 'r', encoding='utf-8') as f:
+                forms.extend(json.load(f))
+        return forms
+    
+    def build_table(self, forms):
+        """Analyse chaque forme une seule fois"""
+        table = {}
+        for form in forms:
+            form = form.lower().strip()
+            if form and form not in table:
+                table[form] = self._analyze(form)
+        return table
+    
+    def save_table(self, path):
+        """Écrit la table forme -> analyse (écriture atomique)"""
+        data = {
+            'rules': self._rules_key(),
+            'forms': {form: list(entry) for form, entry in self.table.items()}
+        }
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
     
     def get_lemma(self, word):
         """
@@ -41,15 +151,33 @@ class Lemmatizer:
         """
         word_lower = word.lower().strip()
         
+        entry = self.table.get(word_lower)
+        if entry is None:
+            generation = self._memo.generation
+            entry = self._memo.get(word_lower)
+            if entry is None:
+                entry = self._analyze(word_lower)
+                self._memo.put(word_lower, entry, generation)
+        
+        lemma, prefix, suffix, lemma_type = entry
+        return {
+            'lemma': lemma,
+            'original': word_lower,
+            'prefix': prefix,
+            'suffix': suffix,
+            'type': lemma_type
+        }
+    
+    def _analyze(self, word_lower):
+        """
+        Décompose un mot : (lemme, préfixe, suffixe, type)
+        
+        Le préfixe retenu est le premier de self.prefixes qui commence le mot,
+        puis le premier suffixe de self.suffixes qui laisse une racine non vide
+        """
         # Vérifier les verbes irréguliers
         if word_lower in self.irregular_verbs:
-            return {
-                'lemma': self.irregular_verbs[word_lower],
-                'original': word_lower,
-                'prefix': None,
-                'suffix': None,
-                'type': 'irregular'
-            }
+            return (self.irregular_verbs[word_lower], None, None, 'irregular')
         
         # Essayer de décomposer le mot
         prefix_found = None
@@ -57,37 +185,86 @@ class Lemmatizer:
         root = word_lower
         
         # Retirer le préfixe
-        for prefix in self.prefixes:
-            if word_lower.startswith(prefix):
-                prefix_found = prefix
-                root = word_lower[len(prefix):]
-                break
+        prefixes = self._prefix_trie.matches(word_lower)
+        if prefixes:
+            _, prefix_found = min(prefixes)
+            root = word_lower[len(prefix_found):]
         
         # Retirer le suffixe
         if root:
-            for suffix in self.suffixes:
-                if root.endswith(suffix) and len(root) > len(suffix):
-                    suffix_found = suffix
-                    root = root[:-len(suffix)]
-                    break
+            suffixes = [
+                match for match in self._suffix_trie.matches(root)
+                if len(root) > len(match[1])
+            ]
+            if suffixes:
+                _, suffix_found = min(suffixes)
+                root = root[:-len(suffix_found)]
         
         # Si aucune décomposition n'a été trouvée
         if not prefix_found and not suffix_found:
-            return {
-                'lemma': word_lower,
-                'original': word_lower,
-                'prefix': None,
-                'suffix': None,
-                'type': 'base'
-            }
+            return (word_lower, None, None, 'base')
         
-        return {
-            'lemma': root,
-            'original': word_lower,
-            'prefix': prefix_found,
-            'suffix': suffix_found,
-            'type': 'derived'
-        }
+        return (root, prefix_found, suffix_found, 'derived')
+    
+    def root_variants(self, word):
+        """
+        Racines possibles d'un mot : le mot, son lemme (et sa voyelle
+        finale 'a', perdue devant un suffixe : 'fiasana' -> 'as' -> 'asa'),
+        chacun privé de ses suffixes possibles, puis les alternances de fin
+        de racine
+        
+        Les règles d'affixes ne donnent pas toujours la même racine aux
+        formes d'une même famille ('asa' est analysé 'as' + 'a' alors que
+        'miasa' donne 'asa', 'fianarana' donne 'anar' et 'mianatra' 'anatr') :
+        deux formes sont apparentées si leurs variantes se recoupent.
+        """
+        word = word.lower().strip()
+        if not word:
+            return []
+        
+        lemma = self.get_lemma(word)['lemma']
+        candidates = [word, lemma]
+        if lemma and lemma[-1] not in 'aeiouy':
+            candidates.append(lemma + 'a')
+        for base in candidates[:2]:
+            for suffix in self.suffixes:
+                if base.endswith(suffix) and len(base) > len(suffix):
+                    candidates.append(base[:-len(suffix)])
+        
+        for candidate in list(candidates):
+            for final, original in self.root_alternations.items():
+                if candidate.endswith(final) and len(candidate) > len(final):
+                    candidates.append(candidate[:-len(final)] + original)
+        
+        return list(dict.fromkeys(candidates))
+    
+    def lemmatize_text(self, text):
+        """
+        Lemmatise tous les mots d'un texte
+        
+        Le texte est tokenisé une fois et chaque forme distincte n'est
+        analysée qu'une fois.
+        
+        Returns:
+            dictionnaire avec les tokens (position et forme) et l'analyse
+            de chaque forme distincte
+        """
+        tokens = []
+        analyses = {}
+        
+        for match in WORD_PATTERN.finditer(text):
+            form = match.group().lower()
+            if form not in analyses:
+                analyses[form] = self.get_lemma(form)
+            tokens.append({
+                'text': match.group(),
+                'start': match.start(),
+                'end': match.end(),
+                'form': form,
+                'lemma': analyses[form]['lemma']
+            })
+        
+        return {'tokens': tokens, 'analyses': analyses}
     
     def analyze_morphology(self, word):
         """
@@ -150,3 +327,22 @@ class Lemmatizer:
             parts.append(f"suffixe '{lemma_info['suffix']}'")
         
         return f"Décomposition : {' + '.join(parts)}"
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    
+    source, target = sys.argv[1], sys.argv[2]
+    with open(source, 'r', encoding='utf-8') as f:
+        forms = json.load(f)
+    
+    lemmatizer = Lemmatizer(table_path=target)
+    lemmatizer.table = lemmatizer.build_table(list(lemmatizer.irregular_verbs) + list(forms))
+    lemmatizer.save_table(target)
+    print(f"{len(lemmatizer.table)} formes analysées : {source} -> {target}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Lexique compact pour le Malagasy
+Stocke une liste de mots triée dans un seul bloc d'octets UTF-8
+indexé par un tableau d'offsets, sauvegardable en fichier binaire
+
+Usage:
+    python -m modules.lexicon data/dictionary.json data/dictionary.lex
+"""
+import json
+import struct
+import sys
+from array import array
+
+MAGIC = b'MGLX'
+VERSION = 1
+# magic, version, nombre de mots, taille du bloc d'octets
+HEADER = struct.Struct('<4sIII')
+
+
+class CompactLexicon:
+    def __init__(self, words=()):
+        """
+        Construit le lexique à partir d'un itérable de mots
+
+        Les mots sont triés selon leur encodage UTF-8 : la recherche
+        dichotomique compare directement les octets.
+        """
+        encoded = sorted({word.encode('utf-8') for word in words})
+
+        offsets = array('I', [0])
+        for word in encoded:
+            offsets.append(offsets[-1] + len(word))
+
+        self._blob = b''.join(encoded)
+        self._offsets = offsets
+
+    @classmethod
+    def from_buffer(cls, buffer, offset=0):
+        """
+        Crée un lexique qui lit directement un tampon (bytes, mmap...)
+        au format de save(), sans copier les données
+        """
+        magic, version, count, blob_size = HEADER.unpack_from(buffer, offset)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Format de lexique compact non reconnu")
+
+        view = memoryview(buffer)
+        start = offset + HEADER.size
+        offsets_end = start + 4 * (count + 1)
+
+        lexicon = cls.__new__(cls)
+        if sys.byteorder == 'little':
+            lexicon._offsets = view[start:offsets_end].cast('I')
+        else:
+            lexicon._offsets = array('I', view[start:offsets_end].tobytes())
+            lexicon._offsets.byteswap()
+        lexicon._blob = view[offsets_end:offsets_end + blob_size]
+        return lexicon
+
+    def to_bytes(self):
+        """Sérialise le lexique au format binaire"""
+        offsets = array('I', self._offsets)
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+
+        header = HEADER.pack(MAGIC, VERSION, len(self), len(self._blob))
+        return header + offsets.tobytes() + bytes(self._blob)
+
+    def save(self, path):
+        """Sauvegarde le lexique dans un fichier binaire"""
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Charge un lexique depuis un fichier binaire"""
+        with open(path, 'rb') as f:
+            return cls.from_buffer(f.read())
+
+    def _key(self, i):
+        """Octets du i-ème mot"""
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+    def _lower_bound(self, key):
+        """Position du premier mot >= key"""
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def index(self, word):
+        """Retourne l'identifiant (rang) du mot, ou -1 s'il est absent"""
+        key = word.encode('utf-8')
+        i = self._lower_bound(key)
+        if i < len(self) and self._key(i) == key:
+            return i
+        return -1
+
+    def word_at(self, i):
+        """Retourne le mot d'identifiant i"""
+        return self._key(i).decode('utf-8')
+
+    def prefix(self, prefix, limit=None):
+        """
+        Retourne les mots commençant par `prefix`, dans l'ordre du lexique
+
+        Args:
+            prefix: début de mot recherché
+            limit: nombre maximum de mots (None pour tous)
+        """
+        key = prefix.encode('utf-8')
+        words = []
+
+        i = self._lower_bound(key)
+        while i < len(self) and (limit is None or len(words) < limit):
+            candidate = self._key(i)
+            if not candidate.startswith(key):
+                break
+            words.append(candidate.decode('utf-8'))
+            i += 1
+
+        return words
+
+    def __contains__(self, word):
+        return isinstance(word, str) and self.index(word) >= 0
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.word_at(i)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        lexicon = CompactLexicon(json.load(f))
+
+    lexicon.save(sys.argv[2])
+    print(f"{len(lexicon)} mots écrits dans {sys.argv[2]}")
+
+
+if __name__ == '__main__':
+    main()
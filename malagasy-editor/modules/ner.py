@@ -2,22 +2,144 @@
 Module de reconnaissance d'entités nommées (NER) pour le Malagasy
 Détecte les villes, régions, personnalités, etc.
 """
+import glob
+import os
 import re
+import threading
+
+from modules.gazetteer import Gazetteer
+
+# Caractère de mot au sens de \b dans les expressions régulières
+WORD_CHAR = re.compile(r'\w')
 
 class NamedEntityRecognizer:
-    def __init__(self):
-        """Initialise le NER"""
-        self.cities = self._load_cities()
-        self.regions = self._load_regions()
-        self.personalities = self._load_personalities()
-        self.organizations = self._load_organizations()
+    def __init__(self, paths=None):
+        """
+        Initialise le NER
+        
+        Args:
+            paths: fichiers JSONL des gazetteers (par défaut
+                data/gazetteers/*.jsonl ; les listes intégrées ne servent
+                que si aucun fichier n'existe)
+        
+        Raises:
+            OSError, ValueError: fichier de gazetteer illisible ou invalide
+        """
+        self.paths = paths
+        self._reload_lock = threading.Lock()
+        # Résultat du dernier rechargement ({'status', 'entries', 'error'})
+        self.reload_status = {'status': 'idle', 'entries': None, 'error': None}
+        
+        # (gazetteer, automate) : remplacé en bloc lors d'un rechargement,
+        # extract() lit l'instantané une seule fois par appel
+        self._snapshot = self._build_snapshot()
+    
+    @property
+    def gazetteer(self):
+        """Gazetteer actuellement utilisé"""
+        return self._snapshot[0]
+    
+    def _gazetteer_paths(self):
+        """Fichiers de gazetteers à charger"""
+        if self.paths is not None:
+            return self.paths
+        return sorted(glob.glob(os.path.join('data', 'gazetteers', '*.jsonl')))
+    
+    def _load_gazetteer(self):
+        """
+        Charge les gazetteers depuis les fichiers, ou les listes intégrées
+        s'il n'y a aucun fichier ; une erreur de lecture est propagée (un
+        fichier invalide ne doit pas être remplacé par les listes intégrées)
+        """
+        paths = self._gazetteer_paths()
+        if paths:
+            return Gazetteer.load(paths)
+        
+        gazetteer = Gazetteer()
+        builtin = [
+            (self._load_cities(), 'VILLE'),
+            (self._load_regions(), 'REGION'),
+            (self._load_personalities(), 'PERSONNALITÉ'),
+            (self._load_organizations(), 'ORGANISATION')
+        ]
+        for entries, entity_type in builtin:
+            for name, info in entries.items():
+                aliases = [info['alias']] if 'alias' in info else []
+                gazetteer.add(name, entity_type, info, aliases)
+        return gazetteer
+    
+    def _build_snapshot(self):
+        """Charge les gazetteers et compile leur automate"""
+        gazetteer = self._load_gazetteer()
+        return gazetteer, gazetteer.build_matcher()
+    
+    def reload(self, blocking=True):
+        """
+        Recharge les gazetteers ; le nouvel automate est construit à côté
+        de l'ancien, qui sert les extractions en cours jusqu'à l'échange
+        
+        En cas d'erreur, l'instantané courant est conservé et l'erreur est
+        enregistrée dans reload_status puis propagée.
+        
+        Args:
+            blocking: attendre la fin d'un rechargement déjà en cours
+                (sinon ne rien faire)
+        
+        Returns:
+            nombre d'entrées chargées, ou None si un rechargement était
+            déjà en cours (blocking=False)
+        """
+        if not self._reload_lock.acquire(blocking):
+            return None
+        try:
+            self.reload_status = {'status': 'reloading', 'entries': None, 'error': None}
+            return self._reload_locked()
+        finally:
+            self._reload_lock.release()
+    
+    def _reload_locked(self):
+        """Construit et échange l'instantané (verrou de rechargement tenu)"""
+        try:
+            snapshot = self._build_snapshot()
+        except Exception as e:
+            self.reload_status = {'status': 'error', 'entries': len(self.gazetteer),
+                                  'error': str(e)}
+            raise
+        
+        self._snapshot = snapshot
+        self.reload_status = {'status': 'ok', 'entries': len(snapshot[0]), 'error': None}
+        return len(snapshot[0])
+    
+    def reload_async(self):
+        """
+        Lance un rechargement dans un thread d'arrière-plan (résultat dans
+        reload_status) ; un seul rechargement tourne à la fois
+        
+        Returns:
+            le thread, ou None si un rechargement était déjà en cours
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return None
+        self.reload_status = {'status': 'reloading', 'entries': None, 'error': None}
+        
+        def run():
+            try:
+                self._reload_locked()
+            except Exception as e:
+                print(f"Erreur rechargement gazetteers: {e}")
+            finally:
+                self._reload_lock.release()
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
     
     def _load_cities(self):
         """Charge la liste des villes malgaches"""
         return {
             'antananarivo': {'type': 'ville', 'region': 'Analamanga', 'label': 'Capitale'},
             'antsirabe': {'type': 'ville', 'region': 'Vakinankaratra'},
-            'toamasina': {'type': 'ville', 'region': 'Atsinanana', 'label': 'Port principal'},
+            'toamasina': {'type': 'ville', 'region': 'Atsinanana', 'label': 'Port principal', 'alias': 'tamatave'},
             'mahajanga': {'type': 'ville', 'region': 'Boeny'},
             'fianarantsoa': {'type': 'ville', 'region': 'Haute Matsiatra'},
             'toliary': {'type': 'ville', 'region': 'Atsimo-Andrefana', 'alias': 'tuléar'},
@@ -26,8 +148,7 @@ class NamedEntityRecognizer:
             'morondava': {'type': 'ville', 'region': 'Menabe'},
             'nosy be': {'type': 'ville', 'region': 'Diana', 'label': 'Île touristique'},
             'manakara': {'type': 'ville', 'region': 'Vatovavy-Fitovinany'},
-            'fort dauphin': {'type': 'ville', 'region': 'Anosy', 'alias': 'tôlanaro'},
-            'tamatave': {'type': 'ville', 'alias': 'toamasina'}
+            'fort dauphin': {'type': 'ville', 'region': 'Anosy', 'alias': 'tôlanaro'}
         }
     
     def _load_regions(self):
@@ -78,69 +199,35 @@ class NamedEntityRecognizer:
         """
         Extrait les entités nommées du texte
         
+        Toutes les entités sont trouvées en une seule passe ; une entité doit
+        être délimitée comme un mot (équivalent de \\b...\\b) et, en cas de
+        chevauchement, la plus longue l'emporte ('nosy be' plutôt que 'be').
+        Un alias ('tamatave') renvoie à l'entrée canonique ('toamasina').
+        
         Returns:
             liste d'entités avec leurs types et positions
         """
+        gazetteer, matcher = self._snapshot
         text_lower = text.lower()
-        entities = []
-        
-        # Chercher les villes
-        for city, info in self.cities.items():
-            pattern = r'\b' + re.escape(city) + r'\b'
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                entities.append({
-                    'text': text[match.start():match.end()],
-                    'start': match.start(),
-                    'end': match.end(),
-                    'type': 'VILLE',
-                    'entity': city,
-                    'info': info
-                })
         
-        # Chercher les régions
-        for region, info in self.regions.items():
-            pattern = r'\b' + re.escape(region) + r'\b'
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                entities.append({
-                    'text': text[match.start():match.end()],
-                    'start': match.start(),
-                    'end': match.end(),
-                    'type': 'REGION',
-                    'entity': region,
-                    'info': info
-                })
+        def is_word(i):
+            return 0 <= i < len(text_lower) and WORD_CHAR.match(text_lower[i]) is not None
         
-        # Chercher les personnalités
-        for person, info in self.personalities.items():
-            pattern = r'\b' + re.escape(person) + r'\b'
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                entities.append({
-                    'text': text[match.start():match.end()],
-                    'start': match.start(),
-                    'end': match.end(),
-                    'type': 'PERSONNALITÉ',
-                    'entity': person,
-                    'info': info
-                })
+        def at_boundary(start, end):
+            return (is_word(start - 1) != is_word(start)
+                    and is_word(end - 1) != is_word(end))
         
-        # Chercher les organisations
-        for org, info in self.organizations.items():
-            pattern = r'\b' + re.escape(org) + r'\b'
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
+        entities = []
+        for start, end, positions in matcher.longest_matches(text_lower, at_boundary):
+            for position in positions:
+                entity_type, name, info = gazetteer.entry(position)
                 entities.append({
-                    'text': text[match.start():match.end()],
-                    'start': match.start(),
-                    'end': match.end(),
-                    'type': 'ORGANISATION',
-                    'entity': org,
+                    'text': text[start:end],
+                    'start': start,
+                    'end': end,
+                    'type': entity_type,
+                    'entity': name,
                     'info': info
                 })
         
-        # Trier par position dans le texte
-        entities.sort(key=lambda x: x['start'])
-        
         return entities
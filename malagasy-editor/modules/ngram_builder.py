@@ -0,0 +1,199 @@
+"""
+Construction du modèle N-grams à partir de corpus bruts
+Lit les corpus par blocs, compte les N-grams dans un pool de processus
+et écrit data/ngrams.json et data/word_frequencies.json
+
+Usage:
+    python -m modules.ngram_builder corpus1.txt corpus2.txt --order 3 --min-count 2
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from operator import itemgetter
+
+from modules.autocomplete import tokenize
+from modules.ngram_store import format_context_key
+
+
+def read_chunks(paths, chunk_bytes):
+    """
+    Lit les corpus ligne par ligne et les regroupe en blocs d'environ
+    chunk_bytes caractères (les N-grams ne franchissent pas les lignes)
+    """
+    chunk = []
+    size = 0
+
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                chunk.append(line)
+                size += len(line)
+                if size >= chunk_bytes:
+                    yield chunk
+                    chunk = []
+                    size = 0
+
+    if chunk:
+        yield chunk
+
+
+def count_chunk(lines, order):
+    """
+    Compte les unigrammes et les N-grams d'un bloc de lignes
+
+    Returns:
+        (nombre de tokens, Counter des mots, Counter des (contexte, mot))
+    """
+    unigrams = Counter()
+    ngrams = Counter()
+    token_count = 0
+
+    for line in lines:
+        tokens = tokenize(line)
+        token_count += len(tokens)
+        unigrams.update(tokens)
+
+        for i in range(1, len(tokens)):
+            # Contextes de 1 à (order - 1) mots précédant tokens[i]
+            for length in range(1, min(order - 1, i) + 1):
+                ngrams[(tuple(tokens[i - length:i]), tokens[i])] += 1
+
+    return token_count, unigrams, ngrams
+
+
+class NgramModelBuilder:
+    def __init__(self, order=3, min_count=1, max_entries=5_000_000):
+        """
+        Initialise le constructeur
+
+        Args:
+            order: ordre maximal des N-grams (3 = trigrammes)
+            min_count: fréquence minimale conservée dans le modèle final
+            max_entries: nombre maximal de N-grams gardés en mémoire ;
+                au-delà, les plus rares sont élagués (comptage approximatif)
+        """
+        self.order = order
+        self.min_count = min_count
+        self.max_entries = max_entries
+
+        self.unigrams = Counter()
+        self.ngrams = Counter()
+        self.token_count = 0
+
+    def merge(self, token_count, unigrams, ngrams):
+        """Fusionne les comptes partiels d'un bloc"""
+        self.token_count += token_count
+        self.unigrams.update(unigrams)
+        self.ngrams.update(ngrams)
+
+        if len(self.ngrams) > self.max_entries:
+            self.ngrams = self._prune(self.ngrams)
+        if len(self.unigrams) > self.max_entries:
+            self.unigrams = self._prune(self.unigrams)
+
+    def _prune(self, counts):
+        """
+        Élague les entrées les plus rares pour revenir à la moitié de
+        max_entries : les `target` entrées les plus fréquentes sont gardées
+        (même si beaucoup d'entrées ont le même compte), les comptes des
+        entrées élaguées sont perdus
+        """
+        target = max(1, self.max_entries // 2)
+        if len(counts) <= target:
+            return counts
+
+        return Counter(dict(heapq.nlargest(target, counts.items(), key=itemgetter(1))))
+
+    def build(self, paths, workers=None, chunk_bytes=4 * 1024 * 1024, report_every=10):
+        """
+        Compte les N-grams de tous les corpus dans un pool de processus
+
+        Le nombre de blocs en cours de traitement est borné : la mémoire
+        ne dépend pas de la taille des corpus.
+        """
+        workers = workers or os.cpu_count() or 1
+        max_pending = workers * 2
+        start = time.perf_counter()
+        done = 0
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            for chunk in read_chunks(paths, chunk_bytes):
+                pending.add(pool.submit(count_chunk, chunk, self.order))
+
+                if len(pending) >= max_pending:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        self.merge(*future.result())
+                        done += 1
+                        if done % report_every == 0:
+                            self._report(start)
+
+            for future in pending:
+                self.merge(*future.result())
+
+        self._report(start)
+
+    def _report(self, start):
+        """Affiche le débit de traitement"""
+        elapsed = time.perf_counter() - start
+        rate = self.token_count / elapsed if elapsed > 0 else 0
+        print(f"{self.token_count} tokens en {elapsed:.1f} s ({rate:,.0f} tokens/s), "
+              f"{len(self.ngrams)} N-grams en mémoire", file=sys.stderr)
+
+    def model(self):
+        """Retourne le modèle {clé de contexte: {mot: fréquence}}"""
+        contexts = {}
+        for (context, word), count in self.ngrams.items():
+            if count >= self.min_count:
+                contexts.setdefault(context, {})[word] = count
+
+        model = {}
+        for context in sorted(contexts):
+            predictions = contexts[context]
+            model[format_context_key(context)] = dict(
+                sorted(predictions.items(), key=lambda x: x[1], reverse=True)
+            )
+        return model
+
+    def frequencies(self):
+        """Retourne les fréquences {mot: fréquence} élaguées par min_count"""
+        return {
+            word: count for word, count in self.unigrams.most_common()
+            if count >= self.min_count
+        }
+
+    def save(self, ngrams_path, frequencies_path):
+        """Écrit le modèle au format attendu par AutoComplete"""
+        with open(ngrams_path, 'w', encoding='utf-8') as f:
+            json.dump(self.model(), f, ensure_ascii=False)
+
+        with open(frequencies_path, 'w', encoding='utf-8') as f:
+            json.dump(self.frequencies(), f, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', nargs='+', help='fichiers texte UTF-8')
+    parser.add_argument('--order', type=int, default=3)
+    parser.add_argument('--min-count', type=int, default=2)
+    parser.add_argument('--max-entries', type=int, default=5_000_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-mb', type=float, default=4)
+    parser.add_argument('--ngrams', default=os.path.join('data', 'ngrams.json'))
+    parser.add_argument('--frequencies', default=os.path.join('data', 'word_frequencies.json'))
+    args = parser.parse_args()
+
+    builder = NgramModelBuilder(args.order, args.min_count, args.max_entries)
+    builder.build(args.corpus, args.workers, int(args.chunk_mb * 1024 * 1024))
+    builder.save(args.ngrams, args.frequencies)
+
+
+if __name__ == '__main__':
+    main()
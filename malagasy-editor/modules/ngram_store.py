@@ -0,0 +1,297 @@
+"""
+Stockage du modèle N-grams
+Index en mémoire (modèle JSON) et format binaire projeté en mémoire (mmap) :
+vocabulaire entier + enregistrements triés, recherchés sur place
+
+Usage:
+    python -m modules.ngram_store data/ngrams.json data/ngrams.bin
+    python -m modules.ngram_store data/ngrams.bin data/ngrams.json
+"""
+import ast
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from modules.lexicon import CompactLexicon
+
+MAGIC = b'MGNG'
+VERSION = 1
+# magic, version, longueur max des contextes, taille du vocabulaire (octets),
+# nombre d'enregistrements
+HEADER = struct.Struct('<4sIIII')
+# Identifiant de remplissage des contextes plus courts que le maximum
+PAD = 0xFFFFFFFF
+
+
+def format_context_key(context):
+    """Convertit un tuple de mots en clé de contexte du fichier JSON"""
+    words = ', '.join(json.dumps(word, ensure_ascii=False) for word in context)
+    return f'({words},)' if len(context) == 1 else f'({words})'
+
+
+def parse_context_key(key):
+    """
+    Convertit une clé de contexte du fichier JSON ('("ny", "trano")')
+    en tuple de mots ; retourne None si la clé est invalide
+    """
+    if isinstance(key, tuple):
+        return key
+
+    # Chemin rapide : les clés écrites avec des guillemets doubles
+    # sont des tableaux JSON entre parenthèses
+    if key.startswith('(') and key.endswith(')'):
+        try:
+            return tuple(json.loads('[' + key[1:-1].rstrip().rstrip(',') + ']'))
+        except ValueError:
+            pass
+
+    try:
+        context = ast.literal_eval(key)
+    except (ValueError, SyntaxError):
+        return None
+
+    if isinstance(context, str):
+        context = (context,)
+    if not isinstance(context, tuple):
+        return None
+    return context
+
+
+class NgramIndex:
+    def __init__(self, raw_ngrams, top_k=10):
+        """
+        Indexe un modèle {clé de contexte: {mot: fréquence}} en mémoire
+
+        Les clés sont converties une seule fois en tuples et chaque contexte
+        garde ses top_k prédictions triées par fréquence.
+        """
+        self.top_k = top_k
+        self.ngrams = {}
+        for key, counts in raw_ngrams.items():
+            context = parse_context_key(key)
+            if context is not None and context not in self.ngrams:
+                self.ngrams[context] = counts
+
+        self._predictions = {
+            context: self._top_words(counts)
+            for context, counts in self.ngrams.items()
+        }
+
+    def _top_words(self, counts):
+        """Retourne les top_k mots d'un dictionnaire {mot: fréquence}"""
+        sorted_words = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+        return tuple(word for word, _ in sorted_words[:self.top_k])
+
+    def predictions(self, context, limit):
+        """Mots suivants les plus fréquents après `context`"""
+        return self._predictions.get(context, ())[:limit]
+
+    def counts(self, context):
+        """Fréquences {mot: fréquence} des mots suivant `context`"""
+        return self.ngrams.get(context, {})
+
+    def items(self):
+        """Itère sur les couples (contexte, {mot: fréquence})"""
+        return self.ngrams.items()
+
+    def __len__(self):
+        return len(self.ngrams)
+
+
+class BinaryNgramModel:
+    def __init__(self, path):
+        """
+        Ouvre un modèle binaire en lecture seule via mmap
+
+        Rien n'est chargé en mémoire : plusieurs processus partagent les
+        mêmes pages du cache système et le démarrage ne dépend pas de la
+        taille du modèle.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.context_size, vocab_size, self.record_count = (
+            HEADER.unpack_from(self._mmap, 0)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Format de modèle N-grams non reconnu: {path}")
+
+        self.vocabulary = CompactLexicon.from_buffer(self._mmap, HEADER.size)
+
+        # Enregistrement : ids du contexte (complétés par PAD), id du mot, fréquence
+        self.width = self.context_size + 2
+        start = HEADER.size + vocab_size
+        end = start + 4 * self.width * self.record_count
+        self._records = memoryview(self._mmap)[start:end].cast('I')
+
+    def _context_ids(self, context):
+        """Convertit un contexte en liste d'ids complétée, ou None si inconnu"""
+        if not context or len(context) > self.context_size:
+            return None
+
+        ids = []
+        for word in context:
+            word_id = self.vocabulary.index(word)
+            if word_id < 0:
+                return None
+            ids.append(word_id)
+
+        return ids + [PAD] * (self.context_size - len(ids))
+
+    def _context_at(self, i):
+        """Ids du contexte du i-ème enregistrement"""
+        start = i * self.width
+        return self._records[start:start + self.context_size].tolist()
+
+    def _find(self, context):
+        """Position du premier enregistrement du contexte, ou -1"""
+        key = self._context_ids(context)
+        if key is None:
+            return -1
+
+        low, high = 0, self.record_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._context_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.record_count and self._context_at(low) == key:
+            return low
+        return -1
+
+    def _iter_records(self, i):
+        """Itère sur (id du mot, fréquence) des enregistrements d'un contexte"""
+        key = self._context_at(i)
+        while i < self.record_count and self._context_at(i) == key:
+            start = i * self.width + self.context_size
+            yield self._records[start], self._records[start + 1]
+            i += 1
+
+    def predictions(self, context, limit):
+        """Mots suivants les plus fréquents après `context`"""
+        i = self._find(context)
+        if i < 0:
+            return ()
+
+        words = []
+        for word_id, _ in self._iter_records(i):
+            if len(words) >= limit:
+                break
+            words.append(self.vocabulary.word_at(word_id))
+        return tuple(words)
+
+    def counts(self, context):
+        """Fréquences {mot: fréquence} des mots suivant `context`"""
+        i = self._find(context)
+        if i < 0:
+            return {}
+        return {
+            self.vocabulary.word_at(word_id): count
+            for word_id, count in self._iter_records(i)
+        }
+
+    def items(self):
+        """Itère sur les couples (contexte, {mot: fréquence})"""
+        i = 0
+        while i < self.record_count:
+            ids = [word_id for word_id in self._context_at(i) if word_id != PAD]
+            context = tuple(self.vocabulary.word_at(word_id) for word_id in ids)
+            counts = {}
+            for word_id, count in self._iter_records(i):
+                counts[self.vocabulary.word_at(word_id)] = count
+                i += 1
+            yield context, counts
+
+    def __len__(self):
+        return self.record_count
+
+
+def save_binary(ngrams, path):
+    """
+    Écrit un modèle au format binaire
+
+    Args:
+        ngrams: itérable de couples (contexte tuple, {mot: fréquence})
+        path: fichier de sortie
+    """
+    ngrams = list(ngrams)
+    words = set()
+    context_size = 1
+    for context, counts in ngrams:
+        words.update(context)
+        words.update(counts)
+        context_size = max(context_size, len(context))
+
+    vocabulary = CompactLexicon(words)
+    ids = {word: i for i, word in enumerate(vocabulary)}
+
+    rows = []
+    for context, counts in ngrams:
+        key = [ids[word] for word in context] + [PAD] * (context_size - len(context))
+        for position, (word, count) in enumerate(counts.items()):
+            rows.append((key, -count, position, ids[word]))
+    # Tri par contexte puis par fréquence décroissante (à égalité, l'ordre
+    # du modèle source est conservé, comme pour l'index en mémoire)
+    rows.sort()
+
+    records = array('I')
+    for key, negative_count, _, word_id in rows:
+        records.extend(key)
+        records.append(word_id)
+        records.append(-negative_count)
+    if sys.byteorder != 'little':
+        records.byteswap()
+
+    # Aligner les enregistrements sur 4 octets
+    vocab_bytes = vocabulary.to_bytes()
+    vocab_bytes += b'\0' * (-len(vocab_bytes) % 4)
+
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, context_size, len(vocab_bytes), len(rows)))
+        f.write(vocab_bytes)
+        f.write(records.tobytes())
+
+
+def is_binary_model(path):
+    """Indique si le fichier est un modèle binaire"""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def load_model(path, top_k=10):
+    """Ouvre un modèle JSON ou binaire selon son contenu"""
+    if is_binary_model(path):
+        return BinaryNgramModel(path)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return NgramIndex(json.load(f), top_k)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+
+    source, target = sys.argv[1], sys.argv[2]
+    model = load_model(source, top_k=0)
+    ngrams = list(model.items())
+
+    if is_binary_model(source):
+        with open(target, 'w', encoding='utf-8') as f:
+            json.dump(
+                {format_context_key(context): counts for context, counts in ngrams},
+                f, ensure_ascii=False
+            )
+    else:
+        save_binary(ngrams, target)
+
+    print(f"{len(ngrams)} contextes convertis : {source} -> {target}")
+
+
+if __name__ == '__main__':
+    main()
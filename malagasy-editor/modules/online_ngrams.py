@@ -0,0 +1,192 @@
+"""
+Apprentissage en ligne du modèle N-grams
+Ajoute le texte accepté par les utilisateurs aux comptes N-grams,
+avec une mémoire bornée, et publie périodiquement un instantané
+fusionné avec le modèle de base, sans bloquer les prédictions
+"""
+import json
+import os
+import threading
+from collections import Counter
+
+from modules.autocomplete import tokenize
+from modules.ngram_builder import NgramModelBuilder, count_chunk
+from modules.ngram_store import format_context_key, parse_context_key
+
+
+class LearnedSnapshot:
+    def __init__(self, predictions=None, most_frequent=()):
+        """
+        Instantané immuable publié par le learner
+
+        Args:
+            predictions: {contexte: top-k des mots suivants (base + appris)}
+            most_frequent: top-k des mots les plus fréquents (base + appris)
+        """
+        self.predictions = predictions or {}
+        self.most_frequent = tuple(most_frequent)
+
+
+class OnlineNgramLearner:
+    def __init__(self, base_model, base_frequencies, n=3, top_k=10,
+                 max_entries=100_000, path=None, interval=60):
+        """
+        Initialise l'apprentissage en ligne
+
+        Args:
+            base_model: modèle de base (NgramIndex ou BinaryNgramModel)
+            base_frequencies: fréquences de base {mot: fréquence}
+            n: ordre des N-grams appris
+            top_k: nombre de prédictions gardées par contexte
+            max_entries: nombre maximal de N-grams appris gardés en mémoire
+                (les plus rares sont élagués au-delà)
+            path: fichier JSON de persistance des comptes appris
+            interval: délai en secondes entre deux fusions/sauvegardes
+        """
+        self.base_model = base_model
+        self.base_frequencies = base_frequencies
+        self.n = n
+        self.top_k = top_k
+        self.path = path
+        self.interval = interval
+
+        self._counts = NgramModelBuilder(order=n, min_count=1, max_entries=max_entries)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Lu sans verrou par les prédictions : remplacé en bloc
+        self.snapshot = LearnedSnapshot(most_frequent=self._base_top_words())
+
+        if path and os.path.exists(path):
+            self._load(path)
+            self.merge()
+
+    def learn(self, text):
+        """Ajoute tous les N-grams d'un texte aux comptes appris"""
+        counts = count_chunk([text], self.n)
+        with self._lock:
+            self._counts.merge(*counts)
+            self._dirty = True
+
+    def learn_accepted(self, context, word):
+        """
+        Ajoute un mot accepté après un contexte (suggestion choisie) :
+        seuls les N-grams se terminant par ce mot sont comptés
+        """
+        tokens = tokenize(context)[-(self.n - 1):]
+        word_tokens = tokenize(word)
+        if not word_tokens:
+            return
+
+        word = word_tokens[0]
+        ngrams = Counter(
+            (tuple(tokens[len(tokens) - length:]), word)
+            for length in range(1, len(tokens) + 1)
+        )
+        with self._lock:
+            self._counts.merge(len(word_tokens), Counter({word: 1}), ngrams)
+            self._dirty = True
+
+    def merge(self):
+        """
+        Fusionne les comptes appris avec le modèle de base et publie un
+        nouvel instantané (remplacement atomique de self.snapshot)
+        """
+        with self._lock:
+            ngrams = Counter(self._counts.ngrams)
+            unigrams = Counter(self._counts.unigrams)
+            self._dirty = False
+
+        learned = {}
+        for (context, word), count in ngrams.items():
+            learned.setdefault(context, Counter())[word] += count
+
+        predictions = {}
+        for context, counts in learned.items():
+            merged = Counter(self.base_model.counts(context))
+            merged.update(counts)
+            predictions[context] = tuple(
+                word for word, _ in merged.most_common(self.top_k)
+            )
+
+        # Seuls les mots appris peuvent dépasser le top-k de base
+        candidates = set(self._base_top_words()) | set(unigrams)
+        frequencies = {
+            word: self.base_frequencies.get(word, 0) + unigrams.get(word, 0)
+            for word in candidates
+        }
+        most_frequent = sorted(frequencies, key=lambda w: frequencies[w], reverse=True)
+
+        self.snapshot = LearnedSnapshot(predictions, most_frequent[:self.top_k])
+
+    def _base_top_words(self):
+        """Top-k des fréquences de base"""
+        ranked = sorted(self.base_frequencies.items(), key=lambda x: x[1], reverse=True)
+        return [word for word, _ in ranked[:self.top_k]]
+
+    def save(self):
+        """Écrit les comptes appris (écriture atomique via un fichier temporaire)"""
+        if not self.path:
+            return
+
+        with self._lock:
+            data = {
+                'unigrams': dict(self._counts.unigrams),
+                'ngrams': [
+                    [format_context_key(context), word, count]
+                    for (context, word), count in self._counts.ngrams.items()
+                ]
+            }
+
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+    def _load(self, path):
+        """Recharge les comptes appris sauvegardés"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        ngrams = Counter()
+        for key, word, count in data.get('ngrams', []):
+            context = parse_context_key(key)
+            if context is not None:
+                ngrams[(context, word)] += count
+
+        unigrams = Counter(data.get('unigrams', {}))
+        with self._lock:
+            self._counts.merge(sum(unigrams.values()), unigrams, ngrams)
+
+    def start(self):
+        """Lance la fusion et la sauvegarde périodiques en arrière-plan"""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête le thread d'arrière-plan après une dernière sauvegarde"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._flush()
+        self._flush()
+
+    def _flush(self):
+        """Fusionne et sauvegarde si de nouveaux comptes ont été appris"""
+        if not self._dirty:
+            return
+
+        try:
+            self.merge()
+            self.save()
+        except OSError as e:
+            print(f"Erreur sauvegarde apprentissage: {e}")
@@ -0,0 +1,95 @@
+"""
+Analyseur phonotactique pour le Malagasy
+Compile toutes les combinaisons interdites en un seul automate
+et parcourt un texte entier en une seule passe
+"""
+import re
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class PhonotacticScanner:
+    def __init__(self, patterns):
+        """
+        Compile les motifs interdits
+
+        Args:
+            patterns: liste de motifs regex ; '^' désigne le début d'un mot
+        """
+        self.patterns = list(patterns)
+
+        # '^' ancre au début du mot, et non plus au début du texte ; la
+        # casse est ignorée sur le texte d'origine (text.lower() peut
+        # changer sa longueur, donc les positions)
+        self._compiled = [
+            re.compile(self._anchor_to_word(pattern), re.IGNORECASE)
+            for pattern in self.patterns
+        ]
+
+        # Alternative unique dans une assertion avant : le moteur avance
+        # d'un caractère à la fois, donc les violations qui se chevauchent
+        # (ex. 'nbp' -> 'nb' et 'bp') sont toutes trouvées
+        alternatives = '|'.join(
+            f'(?P<p{i}>{self._anchor_to_word(pattern)})'
+            for i, pattern in enumerate(self.patterns)
+        )
+        self._matcher = re.compile(f'(?=(?:{alternatives}))', re.IGNORECASE)
+
+    @staticmethod
+    def _anchor_to_word(pattern):
+        """Remplace l'ancre de début de chaîne par une limite de mot"""
+        if pattern.startswith('^'):
+            return r'(?<!\w)' + pattern[1:]
+        return pattern
+
+    def scan(self, text):
+        """
+        Trouve toutes les violations phonotactiques d'un texte
+
+        Returns:
+            liste de violations avec le mot, le motif et leurs positions
+        """
+        violations = []
+
+        # Les mots sont parcourus en même temps que les violations : chaque
+        # mot n'est délimité et copié qu'une fois
+        words = WORD_PATTERN.finditer(text)
+        word = ''
+        word_start = word_end = -1
+
+        for match in self._matcher.finditer(text):
+            first = int(match.lastgroup[1:])
+            position = match.start()
+
+            # L'alternance ne retient que le premier motif trouvé à cette
+            # position : vérifier les suivants sur place (cas rare)
+            hits = [(first, match.end(match.lastgroup))]
+            for i in range(first + 1, len(self._compiled)):
+                other = self._compiled[i].match(text, position)
+                if other:
+                    hits.append((i, other.end()))
+
+            while word_end <= position:
+                found = next(words, None)
+                if found is None:
+                    break
+                word = found.group()
+                word_start, word_end = found.span()
+
+            if word_start <= position < word_end:
+                bounds = (word, word_start, word_end)
+            else:
+                # Motif hors d'un mot : pas de mot à rapporter
+                bounds = ('', position, position)
+
+            for i, end in hits:
+                violations.append({
+                    'word': bounds[0],
+                    'pattern': self.patterns[i],
+                    'start': position,
+                    'end': end,
+                    'word_start': bounds[1],
+                    'word_end': bounds[2]
+                })
+
+        return violations
@@ -0,0 +1,100 @@
+"""
+Trie de complétion de préfixes pour le Malagasy
+Chaque nœud garde en cache ses k mots les plus fréquents : une recherche
+coûte O(longueur du préfixe), quelle que soit la taille du vocabulaire
+"""
+
+
+class _Node:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        # children est None tant que le nœud est une feuille (« bucket ») :
+        # top contient alors tous les mots de son sous-arbre
+        self.children = None
+        self.top = []
+
+
+class PrefixTrie:
+    def __init__(self, frequencies, k=10, bucket_size=32):
+        """
+        Construit le trie à partir d'un dictionnaire {mot: fréquence}
+
+        Args:
+            frequencies: fréquences des mots du vocabulaire
+            k: nombre de complétions gardées en cache par nœud
+            bucket_size: nombre de mots qu'une feuille regroupe avant d'être
+                éclatée (limite le nombre de nœuds d'un grand vocabulaire)
+        """
+        self.k = k
+        self.bucket_size = max(bucket_size, k)
+        self.root = _Node()
+        self._size = 0
+
+        # Insertion par fréquence décroissante : les top-k de chaque nœud
+        # se remplissent dans l'ordre, sans tri ultérieur
+        ranked = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)
+        for word, _ in ranked:
+            if word:
+                self._insert(self.root, word, 0)
+                self._size += 1
+
+    def _insert(self, node, word, depth):
+        """Insère un mot (moins fréquent que tous ceux déjà insérés)"""
+        while True:
+            if node.children is None:
+                node.top.append(word)
+                if len(node.top) > self.bucket_size:
+                    self._burst(node, depth)
+                return
+
+            if len(node.top) < self.k:
+                node.top.append(word)
+            if len(word) == depth:
+                return
+
+            child = node.children.get(word[depth])
+            if child is None:
+                child = node.children[word[depth]] = _Node()
+            node, depth = child, depth + 1
+
+    def _burst(self, node, depth):
+        """Transforme une feuille trop remplie en nœud interne"""
+        words = node.top
+        node.children = {}
+        node.top = words[:self.k]
+
+        for word in words:
+            if len(word) > depth:
+                child = node.children.get(word[depth])
+                if child is None:
+                    child = node.children[word[depth]] = _Node()
+                self._insert(child, word, depth + 1)
+
+    def complete(self, prefix, limit=None):
+        """
+        Retourne les mots les plus fréquents commençant par `prefix`
+
+        Args:
+            prefix: début du mot en cours de saisie
+            limit: nombre maximum de complétions (au plus k)
+        """
+        limit = self.k if limit is None else min(limit, self.k)
+        node = self.root
+
+        for char in prefix:
+            if node.children is None:
+                # Feuille : ses mots sont triés par fréquence
+                matches = [word for word in node.top if word.startswith(prefix)]
+                return matches[:limit]
+
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        if node.children is None:
+            return [word for word in node.top if word.startswith(prefix)][:limit]
+        return node.top[:limit]
+
+    def __len__(self):
+        return self._size
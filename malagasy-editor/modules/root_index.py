@@ -0,0 +1,100 @@
+"""
+Index inversé racine -> formes dérivées
+Permet de retrouver toutes les formes d'une racine (asa -> miasa, fiasana...)
+à partir des analyses du Lemmatizer
+"""
+import threading
+from array import array
+
+
+class RootIndex:
+    def __init__(self, lemmatizer, forms=None):
+        """
+        Initialise l'index
+
+        Args:
+            lemmatizer: instance Lemmatizer utilisée pour trouver les racines
+            forms: formes initiales (par défaut le dictionnaire et les
+                verbes irréguliers du lemmatiseur)
+        """
+        self.lemmatizer = lemmatizer
+
+        # Chaque forme reçoit un id ; les listes de formes par racine
+        # (postings) sont des tableaux d'ids
+        self.forms = []
+        self._form_ids = {}
+        self._counts = array('I')
+        self._postings = {}
+        self._lock = threading.Lock()
+
+        if forms is None:
+            forms = lemmatizer.load_lexicon()
+            # Les racines des verbes irréguliers sont aussi des formes
+            forms = list(forms) + list(lemmatizer.irregular_verbs.values())
+        self.add_forms(forms, count=0)
+
+    def add_forms(self, forms, count=1):
+        """
+        Ajoute des formes à l'index
+
+        Args:
+            forms: itérable de mots
+            count: occurrences ajoutées à chaque forme (0 pour une forme
+                du lexique qui n'a pas encore été vue dans un document)
+        """
+        with self._lock:
+            for form in forms:
+                form = form.lower().strip()
+                if not form:
+                    continue
+
+                form_id = self._form_ids.get(form)
+                if form_id is None:
+                    form_id = len(self.forms)
+                    self.forms.append(form)
+                    self._form_ids[form] = form_id
+                    self._counts.append(0)
+
+                    root = self.lemmatizer.get_lemma(form)['lemma']
+                    self._postings.setdefault(root, array('I')).append(form_id)
+
+                self._counts[form_id] += count
+
+    def add_document(self, text):
+        """Ajoute les mots d'un document (lemmatisé en une passe)"""
+        tokens = self.lemmatizer.lemmatize_text(text)['tokens']
+        self.add_forms(token['form'] for token in tokens)
+
+    def roots(self, query):
+        """Racines correspondant à une requête (Lemmatizer.root_variants)"""
+        return self.lemmatizer.root_variants(query)
+
+    def search(self, query, limit=None):
+        """
+        Formes dont la racine correspond à la requête
+
+        Args:
+            limit: nombre maximal de formes (entier positif), ou None
+
+        Returns:
+            liste de {'form', 'root', 'count'} dans l'ordre d'ajout
+        """
+        if limit is not None and limit < 1:
+            raise ValueError(f"limit doit être positif: {limit}")
+
+        results = []
+        for root in self.roots(query):
+            posting = self._postings.get(root)
+            if posting is None:
+                continue
+            for form_id in posting[:limit]:
+                results.append({
+                    'form': self.forms[form_id],
+                    'root': root,
+                    'count': self._counts[form_id]
+                })
+
+        return results[:limit]
+
+    def __len__(self):
+        return len(self.forms)
@@ -2,17 +2,37 @@
 Module d'analyse de sentiment pour le Malagasy
 Utilise un dictionnaire de mots positifs/négatifs (Bag of Words)
 """
+import hashlib
 import json
 import os
 import re
 
+import numpy as np
+
+from modules.automaton import AhoCorasick
+from modules.cache import LRUCache
+
+# Segments des documents longs : lignes (paragraphes de l'éditeur) ou phrases
+PARAGRAPH_PATTERN = re.compile(r'[^\n]+')
+SENTENCE_PATTERN = re.compile(r'[^.!?\n]+[.!?]*')
+SEGMENT_PATTERNS = {'paragraph': PARAGRAPH_PATTERN, 'sentence': SENTENCE_PATTERN}
+
 class SentimentAnalyzer:
-    def __init__(self):
-        """Initialise l'analyseur de sentiment"""
+    def __init__(self, segment_cache_size=8192):
+        """
+        Initialise l'analyseur de sentiment
+        
+        Args:
+            segment_cache_size: nombre de segments dont les comptes sont
+                gardés en cache par analyze_document
+        """
         self.positive_words = self._load_positive_words()
         self.negative_words = self._load_negative_words()
         self.intensifiers = ['be', 'indrindra', 'loatra', 'tokoa', 'mihitsy']
         self.negations = ['tsy', 'tsia']
+        self._segment_cache = LRUCache(segment_cache_size)
+        self._build_phrase_matcher()
+        self._build_lookup_tables()
     
     def _load_positive_words(self):
         """Charge les mots positifs"""
@@ -44,27 +64,182 @@ class SentimentAnalyzer:
             'fahadisoana', 'tsy fahaizana', 'tsy fahombiazana'
         ])
     
-    def analyze(self, text):
+    def _build_phrase_matcher(self):
+        """
+        Compile les expressions de plusieurs tokens du lexique ('tsara fanahy',
+        'tsy tsara', 'fahafaham-po'...) en un automate sur les tokens
+        """
+        phrases = []
+        for entry in self.positive_words | self.negative_words:
+            tokens = tuple(self._tokenize(entry))
+            if len(tokens) > 1:
+                phrases.append((tokens, entry))
+        self.phrase_matcher = AhoCorasick(phrases)
+    
+    def _merge_phrases(self, tokens):
+        """
+        Remplace les expressions du lexique par une seule unité (la plus
+        longue l'emporte), en une passe linéaire sur les tokens ; la négation
+        et l'intensification s'appliquent ensuite aux unités voisines
+        """
+        # Fin de la plus longue expression commençant à chaque position
+        longest_end = {}
+        for start, end, _ in self.phrase_matcher.iter_matches(tokens):
+            longest_end[start] = max(end, longest_end.get(start, 0))
+        if not longest_end:
+            return tokens
+        
+        def accept(start, end):
+            # 'tsy tsara' s'efface devant 'tsy' + 'tsara fanahy' : la négation
+            # porte alors sur l'expression plus longue qui suit
+            return not (tokens[start] in self.negations
+                        and longest_end.get(start + 1, 0) > end)
+        
+        matches = self.phrase_matcher.longest_matches(tokens, accept)
+        
+        units = []
+        position = 0
+        for start, end, phrase in matches:
+            units.extend(tokens[position:start])
+            units.append(phrase)
+            position = end
+        units.extend(tokens[position:])
+        return units
+    
+    def _build_lookup_tables(self):
+        """
+        Construit les tables du calcul vectorisé : chaque mot du lexique
+        reçoit un id entier (0 = mot inconnu) et les tableaux NumPy donnent
+        sa polarité et s'il est une négation ou un intensificateur
+        """
+        words = (self.positive_words | self.negative_words
+                 | set(self.negations) | set(self.intensifiers))
+        self._token_ids = {word: i for i, word in enumerate(sorted(words), 1)}
+        
+        size = len(self._token_ids) + 1
+        self._polarity = np.zeros(size, dtype=np.int8)
+        self._is_negation = np.zeros(size, dtype=bool)
+        self._is_intensifier = np.zeros(size, dtype=bool)
+        
+        for word, i in self._token_ids.items():
+            # Un mot des deux listes compte comme positif (comme dans _score_tokens)
+            if word in self.positive_words:
+                self._polarity[i] = 1
+            elif word in self.negative_words:
+                self._polarity[i] = -1
+            self._is_negation[i] = word in self.negations
+            self._is_intensifier[i] = word in self.intensifiers
+    
+    def analyze(self, text, details=True):
         """
         Analyse le sentiment d'un texte
         
+        Args:
+            text: texte à analyser
+            details: si False, les totaux sont calculés par le chemin
+                vectorisé et la réponse ne contient pas 'details'
+        
         Returns:
             dictionnaire avec score et classification
         """
         # Nettoyer et tokeniser
         tokens = self._tokenize(text)
         
-        if not tokens:
-            return {
-                'sentiment': 'neutre',
-                'score': 0,
-                'confidence': 0,
-                'positive_count': 0,
-                'negative_count': 0,
-                'details': []
-            }
-        
-        # Compter les mots positifs et négatifs
+        units = self._merge_phrases(tokens)
+        
+        if not details:
+            positive_count, negative_count = self._score_vectorized(units)
+            return self._classify(positive_count, negative_count, len(tokens))
+        
+        positive_count, negative_count, token_details = self._score_tokens(units)
+        result = self._classify(positive_count, negative_count, len(tokens))
+        result['details'] = token_details
+        return result
+    
+    def analyze_document(self, text, mode='paragraph', compact=False):
+        """
+        Analyse un long document segment par segment
+        
+        Chaque segment (paragraphe ou phrase) est analysé indépendamment et
+        ses comptes sont mis en cache selon l'empreinte de son contenu : après
+        une modification, seuls les segments changés sont recalculés. Le score
+        du document est agrégé à partir des comptes des segments.
+        
+        Args:
+            text: texte du document
+            mode: 'paragraph' ou 'sentence'
+            compact: si True, la réponse ne contient pas les détails par mot
+            
+        Returns:
+            dictionnaire d'analyse du document avec la liste des segments
+            (positions du segment sans les espaces qui l'entourent)
+        
+        Raises:
+            ValueError: mode inconnu
+        """
+        pattern = SEGMENT_PATTERNS.get(mode)
+        if pattern is None:
+            raise ValueError(f"Mode de segmentation inconnu: {mode}")
+        
+        positive_total = 0
+        negative_total = 0
+        token_total = 0
+        recomputed = 0
+        segments = []
+        details = []
+        
+        for match in pattern.finditer(text):
+            raw = match.group()
+            segment = raw.strip()
+            if not segment:
+                continue
+            start = match.start() + len(raw) - len(raw.lstrip())
+            
+            key = hashlib.md5(segment.encode('utf-8')).digest()
+            generation = self._segment_cache.generation
+            counts = self._segment_cache.get(key)
+            # Les détails ne sont calculés que lorsqu'ils sont demandés
+            if counts is None or (not compact and counts[3] is None):
+                tokens = self._tokenize(segment)
+                units = self._merge_phrases(tokens)
+                if compact:
+                    positive, negative = self._score_vectorized(units)
+                    segment_details = None
+                else:
+                    positive, negative, segment_details = self._score_tokens(units)
+                    segment_details = tuple(segment_details)
+                counts = (positive, negative, len(tokens), segment_details)
+                self._segment_cache.put(key, counts, generation)
+                recomputed += 1
+            
+            positive, negative, token_count, segment_details = counts
+            positive_total += positive
+            negative_total += negative
+            token_total += token_count
+            
+            summary = self._classify(positive, negative, token_count)
+            summary['start'] = start
+            summary['end'] = start + len(segment)
+            segments.append(summary)
+            
+            if not compact:
+                details.extend(dict(detail) for detail in segment_details)
+        
+        result = self._classify(positive_total, negative_total, token_total)
+        result['segments'] = segments
+        result['recomputed_segments'] = recomputed
+        if not compact:
+            result['details'] = details
+        return result
+    
+    def _score_tokens(self, tokens):
+        """
+        Compte les mots positifs et négatifs d'une liste de tokens
+        (les expressions fusionnées par _merge_phrases comptent pour un token)
+        
+        Returns:
+            (total positif, total négatif, détails par mot)
+        """
         positive_count = 0
         negative_count = 0
         details = []
@@ -114,6 +289,36 @@ class SentimentAnalyzer:
                         'weight': intensifier_boost
                     })
         
+        return positive_count, negative_count, details
+    
+    def _score_vectorized(self, tokens):
+        """
+        Équivalent vectorisé de _score_tokens, sans les détails
+        
+        Returns:
+            (total positif, total négatif)
+        """
+        if not tokens:
+            return 0, 0
+        
+        token_ids = self._token_ids
+        ids = np.fromiter((token_ids.get(token, 0) for token in tokens),
+                          dtype=np.int32, count=len(tokens))
+        
+        # Négation : le token précédent est 'tsy'/'tsia' (inverse la polarité)
+        polarity = self._polarity[ids].astype(np.int8)
+        polarity[1:][self._is_negation[ids[:-1]]] *= -1
+        
+        # Intensificateur : le token suivant multiplie le poids par 1.5
+        weights = np.ones(len(ids))
+        weights[:-1][self._is_intensifier[ids[1:]]] = 1.5
+        
+        positive_count = weights[polarity > 0].sum()
+        negative_count = weights[polarity < 0].sum()
+        return float(positive_count), float(negative_count)
+    
+    def _classify(self, positive_count, negative_count, token_count):
+        """Calcule score, confiance et classification à partir des comptes"""
         # Calculer le score (-1 à +1)
         total_count = positive_count + negative_count
         if total_count == 0:
@@ -121,7 +326,7 @@ class SentimentAnalyzer:
             confidence = 0
         else:
             score = (positive_count - negative_count) / total_count
-            confidence = min(total_count / len(tokens), 1.0)
+            confidence = min(total_count / token_count, 1.0)
         
         # Classifier le sentiment
         if score > 0.2:
@@ -136,8 +341,7 @@ class SentimentAnalyzer:
             'score': round(score, 2),
             'confidence': round(confidence, 2),
             'positive_count': int(positive_count),
-            'negative_count': int(negative_count),
-            'details': details
+            'negative_count': int(negative_count)
         }
     
     def _tokenize(self, text):
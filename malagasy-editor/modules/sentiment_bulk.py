@@ -0,0 +1,198 @@
+"""
+Analyse de sentiment en masse
+Lit un corpus (fichier JSONL ou dossier de fichiers texte), répartit les
+documents sur un pool de processus et écrit les résultats en NDJSON,
+dans l'ordre d'entrée
+
+Usage:
+    python -m modules.sentiment_bulk articles.jsonl -o resultats.ndjson
+    python -m modules.sentiment_bulk corpus/ --workers 8 --chunksize 128
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from functools import partial
+from multiprocessing import Pool
+
+from modules.sentiment_analyzer import SentimentAnalyzer
+
+# Analyseur propre à chaque processus du pool (créé par _init_worker)
+_analyzer = None
+
+
+def read_documents(path, field='text'):
+    """
+    Itère sur les documents d'un corpus
+
+    Args:
+        path: fichier JSONL (un objet ou une chaîne par ligne) ou dossier
+            de fichiers texte UTF-8
+        field: champ contenant le texte dans les objets JSON
+
+    Yields:
+        dictionnaires {'id': ..., 'text': ...}
+    """
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                    yield {'id': os.path.relpath(file_path, path), 'text': f.read()}
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            document = json.loads(line)
+            if isinstance(document, str):
+                yield {'id': line_number, 'text': document}
+            else:
+                yield {
+                    'id': document.get('id', line_number),
+                    'text': document.get(field) or ''
+                }
+
+
+def _init_worker(analyzer=None):
+    """
+    Installe l'analyseur une seule fois par processus du pool (celui du
+    parent, hérité sans copie avec fork, sinon un nouvel analyseur)
+    """
+    global _analyzer
+    _analyzer = analyzer or SentimentAnalyzer()
+
+
+def _score_document(analyzer, document, compact):
+    """Analyse un document et ajoute son id au résultat"""
+    result = analyzer.analyze(document['text'], details=not compact)
+    return {'id': document['id'], **result}
+
+
+def _analyze_document(document, compact=True):
+    """Analyse un document dans un processus du pool"""
+    return _score_document(_analyzer, document, compact)
+
+
+class SentimentPool:
+    def __init__(self, analyzer=None, workers=None, max_jobs=2):
+        """
+        Pool de processus partagé par les analyses en masse d'un serveur
+
+        Les processus sont créés une seule fois : créer le pool au
+        démarrage, avant les threads de l'application, pour ne pas
+        dupliquer un processus qui a déjà des threads en cours.
+
+        Args:
+            analyzer: SentimentAnalyzer partagé avec les processus
+            workers: nombre de processus (par défaut le nombre de cœurs)
+            max_jobs: nombre maximal d'analyses simultanées sur le pool
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = Pool(self.workers, initializer=_init_worker, initargs=(analyzer,))
+        self._slots = threading.BoundedSemaphore(max_jobs)
+
+    def acquire(self):
+        """Réserve une place pour une analyse ; False si le pool est saturé"""
+        return self._slots.acquire(blocking=False)
+
+    def release(self):
+        """Libère la place réservée par acquire()"""
+        self._slots.release()
+
+    def imap(self, documents, chunksize=64, compact=True):
+        """Résultats des documents, dans l'ordre d'entrée"""
+        return self._pool.imap(partial(_analyze_document, compact=compact),
+                               documents, chunksize)
+
+    def close(self):
+        """Arrête les processus du pool"""
+        self._pool.terminate()
+        self._pool.join()
+
+
+def analyze_bulk(documents, workers=None, chunksize=64, compact=True, analyzer=None,
+                 pool=None):
+    """
+    Analyse une suite de documents
+
+    Les documents sont envoyés au pool par paquets de `chunksize` et les
+    résultats sont rendus dans l'ordre d'entrée, au fil de l'eau.
+
+    Args:
+        documents: itérable de {'id': ..., 'text': ...}
+        workers: nombre de processus (1 = dans le processus courant)
+        chunksize: nombre de documents envoyés à la fois à un processus
+        compact: si True, les détails par mot sont omis
+        analyzer: SentimentAnalyzer utilisé dans le processus courant
+            (workers=1) ; un nouvel analyseur est créé par défaut
+        pool: SentimentPool existant à utiliser (workers est alors ignoré)
+
+    Yields:
+        dictionnaires de résultat, avec l'id du document
+    """
+    if chunksize < 1:
+        raise ValueError(f"chunksize doit être positif: {chunksize}")
+    if pool is not None:
+        yield from pool.imap(documents, chunksize, compact)
+        return
+
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        # Pas d'état global : plusieurs threads peuvent analyser en parallèle
+        analyzer = analyzer or SentimentAnalyzer()
+        for document in documents:
+            yield _score_document(analyzer, document, compact)
+        return
+
+    with Pool(workers, initializer=_init_worker) as pool:
+        yield from pool.imap(partial(_analyze_document, compact=compact), documents, chunksize)
+
+
+def _report(count, start):
+    """Affiche le débit de traitement"""
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"{count} documents en {elapsed:.1f} s ({rate:,.0f} docs/s)", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('corpus', help='fichier JSONL ou dossier de fichiers texte')
+    parser.add_argument('-o', '--output', default=None, help='fichier NDJSON (sortie standard par défaut)')
+    parser.add_argument('--field', default='text', help='champ du texte dans le JSONL')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=64)
+    parser.add_argument('--details', action='store_true', help='inclure les détails par mot')
+    parser.add_argument('--report-every', type=int, default=10000)
+    args = parser.parse_args()
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    start = time.perf_counter()
+    count = 0
+
+    try:
+        documents = read_documents(args.corpus, args.field)
+        for result in analyze_bulk(documents, args.workers, args.chunksize,
+                                   compact=not args.details):
+            output.write(json.dumps(result, ensure_ascii=False) + '\n')
+            count += 1
+            if count % args.report_every == 0:
+                _report(count, start)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    _report(count, start)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,19 +3,51 @@ Module de correction orthographique pour le Malagasy
 Utilise la distance de Levenshtein et des règles phonotactiques
 """
 import re
+import numpy as np
 from rapidfuzz import fuzz, process
 import json
 import os
+from modules.symspell import SymSpellIndex
+from modules.phonotactics import PhonotacticScanner
+from modules.lexicon import CompactLexicon
+from modules.cache import LRUCache
 
 class SpellChecker:
-    def __init__(self):
-        """Initialise le correcteur orthographique"""
-        self.dictionary = self._load_dictionary()
+    def __init__(self, suggestion_engine='rapidfuzz', min_score=70, compact_lexicon=False,
+                 cache_size=4096):
+        """
+        Initialise le correcteur orthographique
+        
+        Args:
+            suggestion_engine: 'rapidfuzz' (parcours complet du dictionnaire)
+                ou 'symspell' (index de suppressions précalculé)
+            min_score: score fuzz.ratio minimum des suggestions
+                (None pour désactiver le filtre)
+            compact_lexicon: stocker le dictionnaire dans un CompactLexicon
+                (data/dictionary.lex s'il existe) plutôt qu'un set
+            cache_size: nombre de résultats gardés en cache LRU pour check()
+                et pour les suggestions (0 pour désactiver)
+        """
+        self.dictionary = self._load_dictionary(compact_lexicon)
+        self.min_score = min_score
+        
+        # Index SymSpell construit une seule fois au chargement
+        self.suggestion_engine = suggestion_engine
+        self.symspell = None
+        if suggestion_engine == 'symspell':
+            self.symspell = SymSpellIndex(self.dictionary)
+        elif suggestion_engine != 'rapidfuzz':
+            raise ValueError(f"Moteur de suggestions inconnu: {suggestion_engine}")
+        
+        # Caches LRU, vidés à chaque modification du dictionnaire
+        self._check_cache = LRUCache(cache_size)
+        self._suggestion_cache = LRUCache(cache_size)
         
         # Règles phonotactiques malagasy - combinaisons interdites
         self.forbidden_patterns = [
             r'nb', r'mk', r'^nk', r'dt', r'bp', r'sz'
         ]
+        self.phonotactics = PhonotacticScanner(self.forbidden_patterns)
         
         # Préfixes courants
         self.prefixes = ['mi', 'ma', 'man', 'mam', 'maha', 'mpan', 'mpam', 'fi', 'fan', 'fam']
@@ -23,16 +55,26 @@ class SpellChecker:
         # Suffixes courants
         self.suffixes = ['ana', 'ina', 'na']
     
-    def _load_dictionary(self):
+    def _load_dictionary(self, compact=False):
         """Charge le dictionnaire malagasy"""
+        if compact:
+            lexicon_path = os.path.join('data', 'dictionary.lex')
+            if os.path.exists(lexicon_path):
+                return CompactLexicon.load(lexicon_path)
+            return CompactLexicon(self._load_word_list())
+        
+        return set(self._load_word_list())
+    
+    def _load_word_list(self):
+        """Charge la liste de mots du dictionnaire JSON"""
         dict_path = os.path.join('data', 'dictionary.json')
         
         if os.path.exists(dict_path):
             with open(dict_path, 'r', encoding='utf-8') as f:
-                return set(json.load(f))
+                return json.load(f)
         
         # Dictionnaire de base si le fichier n'existe pas
-        return set([
+        return [
             'malagasy', 'teny', 'trano', 'vary', 'rano', 'fihavanana',
             'vahiny', 'tsara', 'ratsy', 'lehibe', 'kely', 'ankehitriny',
             'omaly', 'rahampitso', 'miaramila', 'mpanabe', 'mpianatra',
@@ -48,22 +90,31 @@ class SpellChecker:
             'fitiavana', 'fankasitrahana', 'fiadanana', 'fahasoavana',
             'tsara fanahy', 'be fitiavana', 'mahay', 'hendry', 'marina',
             'fahamarinana', 'rariny', 'fahamarinana', 'fahasoavana'
-        ])
+        ]
     
     def validate_phonetics(self, word):
         """
         Valide les règles phonotactiques du malagasy
         Retourne (is_valid, liste_erreurs)
         """
-        word_lower = word.lower()
-        errors = []
-        
-        for pattern in self.forbidden_patterns:
-            if re.search(pattern, word_lower):
-                errors.append(f"Combinaison interdite trouvée: {pattern}")
+        found = {violation['pattern'] for violation in self.phonotactics.scan(word)}
+        errors = [
+            f"Combinaison interdite trouvée: {pattern}"
+            for pattern in self.forbidden_patterns
+            if pattern in found
+        ]
         
         return len(errors) == 0, errors
     
+    def scan_phonetics(self, text):
+        """
+        Trouve toutes les violations phonotactiques d'un texte en une passe
+        
+        Returns:
+            liste de violations (mot, motif, positions)
+        """
+        return self.phonotactics.scan(text)
+    
     def check(self, word):
         """
         Vérifie l'orthographe d'un mot
@@ -71,6 +122,17 @@ class SpellChecker:
         """
         word_lower = word.lower()
         
+        generation = self._check_cache.generation
+        cached = self._check_cache.get(word_lower)
+        if cached is not None:
+            return self._copy_result(cached)
+        
+        result = self._check_uncached(word_lower)
+        self._check_cache.put(word_lower, result, generation)
+        return self._copy_result(result)
+    
+    def _check_uncached(self, word_lower):
+        """Vérifie l'orthographe d'un mot en minuscules, sans passer par le cache"""
         # Vérifier si le mot existe dans le dictionnaire
         if word_lower in self.dictionary:
             return {
@@ -80,7 +142,7 @@ class SpellChecker:
             }
         
         # Vérifier les règles phonotactiques
-        is_valid_phonetics, phonetic_errors = self.validate_phonetics(word)
+        is_valid_phonetics, phonetic_errors = self.validate_phonetics(word_lower)
         
         # Trouver les suggestions avec distance de Levenshtein
         suggestions = self._get_suggestions(word_lower)
@@ -92,11 +154,139 @@ class SpellChecker:
             'phonetically_valid': is_valid_phonetics
         }
     
+    def check_many(self, words, limit=5, workers=-1, max_cells=10_000_000):
+        """
+        Vérifie l'orthographe d'une liste de mots en une seule passe
+        
+        Avec la limite par défaut, les résultats passent par le même cache
+        que check() (et ses compteurs) ; les mots
+        absents du cache et inconnus sont comparés à tout le dictionnaire
+        sous forme de matrice de scores (rapidfuzz.process.cdist), calculée
+        sur plusieurs cœurs.
+        
+        Args:
+            words: liste de mots à vérifier
+            limit: nombre maximum de suggestions par mot
+            workers: nombre de threads pour cdist (-1 = tous les cœurs)
+            max_cells: taille maximale d'un bloc de la matrice de scores
+        
+        Returns:
+            liste de résultats, dans l'ordre de `words`, au format de check()
+        """
+        # Les résultats de check() en cache ont 5 suggestions au plus
+        use_cache = limit == 5
+        generation = self._check_cache.generation
+        dictionary = self.dictionary
+        results = {}
+        missing = []
+        for word_lower in dict.fromkeys(word.lower() for word in words):
+            cached = self._check_cache.get(word_lower) if use_cache else None
+            if cached is None:
+                missing.append(word_lower)
+            else:
+                results[word_lower] = cached
+        
+        unknown = [word for word in missing if word not in dictionary]
+        suggestions = self._get_suggestions_many(unknown, limit, workers, max_cells)
+        
+        for word_lower in missing:
+            if word_lower not in suggestions:
+                results[word_lower] = {
+                    'correct': True,
+                    'suggestions': [],
+                    'phonetic_errors': []
+                }
+                continue
+            
+            is_valid_phonetics, phonetic_errors = self.validate_phonetics(word_lower)
+            results[word_lower] = {
+                'correct': False,
+                'suggestions': suggestions[word_lower],
+                'phonetic_errors': phonetic_errors,
+                'phonetically_valid': is_valid_phonetics
+            }
+        
+        if use_cache:
+            for word_lower in missing:
+                self._check_cache.put(word_lower, results[word_lower], generation)
+        
+        # Chaque occurrence reçoit sa propre copie du résultat
+        return [self._copy_result(results[word.lower()]) for word in words]
+    
+    @staticmethod
+    def _copy_result(result):
+        """Copie un résultat pour que l'appelant ne modifie pas le cache"""
+        return {
+            **result,
+            'suggestions': list(result['suggestions']),
+            'phonetic_errors': list(result['phonetic_errors'])
+        }
+    
+    def _get_suggestions_many(self, words, limit, workers, max_cells):
+        """Calcule les suggestions de plusieurs mots par blocs de la matrice de scores"""
+        if not words or not self.dictionary:
+            return {word: [] for word in words}
+        
+        # L'index SymSpell répond déjà sans parcourir le dictionnaire
+        if self.symspell is not None:
+            return {word: self._get_suggestions(word, limit) for word in words}
+        
+        generation = self._suggestion_cache.generation
+        suggestions = {}
+        missing = []
+        for word in words:
+            cached = self._suggestion_cache.get((word, limit))
+            if cached is None:
+                missing.append(word)
+            else:
+                suggestions[word] = list(cached)
+        
+        if not missing:
+            return suggestions
+        
+        words = missing
+        choices = list(self.dictionary)
+        cutoff = self.min_score or 0
+        rows_per_block = max(1, max_cells // len(choices))
+        
+        for block_start in range(0, len(words), rows_per_block):
+            block = words[block_start:block_start + rows_per_block]
+            scores = process.cdist(
+                block,
+                choices,
+                scorer=fuzz.ratio,
+                score_cutoff=cutoff,
+                workers=workers
+            )
+            
+            for word, row in zip(block, scores):
+                candidates = np.flatnonzero(row >= cutoff) if cutoff else np.arange(len(row))
+                # Tri stable : à score égal, même ordre que process.extract
+                best = candidates[np.argsort(-row[candidates], kind='stable')[:limit]]
+                suggestions[word] = [choices[i] for i in best]
+                self._suggestion_cache.put((word, limit), tuple(suggestions[word]), generation)
+        
+        return suggestions
+    
     def _get_suggestions(self, word, limit=5):
         """Trouve les suggestions basées sur la distance de Levenshtein"""
         if not self.dictionary:
             return []
         
+        generation = self._suggestion_cache.generation
+        cached = self._suggestion_cache.get((word, limit))
+        if cached is not None:
+            return list(cached)
+        
+        suggestions = self._compute_suggestions(word, limit)
+        self._suggestion_cache.put((word, limit), tuple(suggestions), generation)
+        return suggestions
+    
+    def _compute_suggestions(self, word, limit):
+        """Calcule les suggestions d'un mot (sans cache)"""        
+        if self.symspell is not None:
+            return self.symspell.lookup(word, limit=limit, min_score=self.min_score)
+        
         # Utiliser rapidfuzz pour trouver les mots similaires
         results = process.extract(
             word, 
@@ -105,11 +295,44 @@ class SpellChecker:
             limit=limit
         )
         
-        # Filtrer les suggestions avec un score minimum de 70
-        suggestions = [match[0] for match in results if match[1] >= 70]
+        # Filtrer les suggestions avec un score minimum (70 par défaut)
+        suggestions = [
+            match[0] for match in results
+            if self.min_score is None or match[1] >= self.min_score
+        ]
         
         return suggestions
     
+    def add_words(self, words):
+        """
+        Ajoute des mots au dictionnaire et invalide les caches
+        
+        Le nouveau dictionnaire est construit à côté puis échangé en une
+        affectation : une vérification en cours ne voit jamais un
+        dictionnaire modifié pendant qu'elle le parcourt.
+        """
+        words = [word.lower() for word in words]
+        
+        if isinstance(self.dictionary, CompactLexicon):
+            # Le lexique compact est immuable : on le reconstruit
+            self.dictionary = CompactLexicon(list(self.dictionary) + words)
+        else:
+            self.dictionary = self.dictionary | set(words)
+        
+        if self.symspell is not None:
+            for word in words:
+                self.symspell.add(word)
+        
+        self._check_cache.clear()
+        self._suggestion_cache.clear()
+    
+    def cache_stats(self):
+        """Retourne les compteurs des caches (hits, misses, évictions)"""
+        return {
+            'check': self._check_cache.stats(),
+            'suggestions': self._suggestion_cache.stats()
+        }
+    
     def is_likely_malagasy(self, word):
         """
         Détermine si un mot est probablement malagasy
@@ -128,3 +351,48 @@ class SpellChecker:
                 return True
         
         return False
+    
+    def check_document(self, text):
+        """
+        Vérifie l'orthographe d'un texte complet en une seule passe
+        
+        Le texte est tokenisé une seule fois, les mots répétés ne sont
+        vérifiés qu'une fois, puis chaque occurrence fautive est rapportée
+        avec sa position dans le texte.
+        
+        Returns:
+            dictionnaire avec le nombre de mots et la liste des erreurs
+        """
+        occurrences = {}
+        word_count = 0
+        
+        for match in re.finditer(r'\b\w+\b', text):
+            word_count += 1
+            occurrences.setdefault(match.group().lower(), []).append(match)
+        
+        unique_words = list(occurrences)
+        errors = []
+        for word_lower, result in zip(unique_words, self.check_many(unique_words)):
+            matches = occurrences[word_lower]
+            if result['correct']:
+                continue
+            
+            for match in matches:
+                errors.append({
+                    'word': match.group(),
+                    'start': match.start(),
+                    'end': match.end(),
+                    'suggestions': result['suggestions'],
+                    'phonetic_errors': result['phonetic_errors'],
+                    'phonetically_valid': result['phonetically_valid']
+                })
+        
+        # Trier par position dans le texte
+        errors.sort(key=lambda x: x['start'])
+        
+        return {
+            'word_count': word_count,
+            'unique_words': len(occurrences),
+            'errors': errors,
+            'phonetic_violations': self.scan_phonetics(text)
+        }
@@ -0,0 +1,104 @@
+"""
+Index de suggestions par suppressions symétriques (SymSpell)
+Précalcule les suppressions de chaque mot du dictionnaire au chargement
+pour répondre aux recherches sans parcourir tout le lexique
+"""
+from rapidfuzz import fuzz
+from rapidfuzz.distance import Levenshtein
+
+
+class SymSpellIndex:
+    def __init__(self, words, max_distance=2, prefix_length=7):
+        """
+        Construit l'index des suppressions
+
+        Args:
+            words: itérable de mots du dictionnaire
+            max_distance: distance d'édition maximale des suggestions
+            prefix_length: longueur du préfixe indexé (limite la taille de l'index)
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = set()
+        self.deletes = {}
+
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        """Ajoute un mot et ses suppressions à l'index"""
+        if word in self.words:
+            return
+
+        self.words.add(word)
+        for variant in self._edits(word[:self.prefix_length]):
+            # Un seul mot par clé dans la grande majorité des cas :
+            # on évite alors d'allouer une liste
+            bucket = self.deletes.get(variant)
+            if bucket is None:
+                self.deletes[variant] = word
+            elif isinstance(bucket, str):
+                self.deletes[variant] = [bucket, word]
+            else:
+                bucket.append(word)
+
+    def _edits(self, word):
+        """Génère le mot et toutes ses suppressions jusqu'à max_distance"""
+        edits = {word}
+        frontier = {word}
+
+        for _ in range(self.max_distance):
+            next_frontier = set()
+            for candidate in frontier:
+                if len(candidate) <= 1:
+                    continue
+                for i in range(len(candidate)):
+                    next_frontier.add(candidate[:i] + candidate[i + 1:])
+            next_frontier -= edits
+            edits |= next_frontier
+            frontier = next_frontier
+
+        return edits
+
+    def lookup(self, word, limit=5, min_score=None):
+        """
+        Trouve les mots du dictionnaire proches de `word`
+
+        Args:
+            word: mot à corriger
+            limit: nombre maximum de suggestions
+            min_score: score fuzz.ratio minimum (None pour ne pas filtrer)
+
+        Returns:
+            liste de mots triés par score décroissant
+        """
+        candidates = set()
+        for variant in self._edits(word[:self.prefix_length]):
+            bucket = self.deletes.get(variant)
+            if bucket is None:
+                continue
+            if isinstance(bucket, str):
+                candidates.add(bucket)
+            else:
+                candidates.update(bucket)
+
+        scored = []
+        for candidate in candidates:
+            # Vérifier la distance réelle sur le mot complet
+            distance = Levenshtein.distance(
+                word, candidate, score_cutoff=self.max_distance
+            )
+            if distance > self.max_distance:
+                continue
+
+            score = fuzz.ratio(word, candidate)
+            if min_score is not None and score < min_score:
+                continue
+
+            scored.append((-score, distance, candidate))
+
+        scored.sort()
+        return [candidate for _, _, candidate in scored[:limit]]
+
+    def __len__(self):
+        return len(self.words)
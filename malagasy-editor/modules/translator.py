@@ -4,12 +4,71 @@ Utilise un dictionnaire bidirectionnel
 """
 import json
 import os
+import re
+import unicodedata
+from bisect import bisect_left
+from rapidfuzz.distance import Levenshtein
+from modules.automaton import AhoCorasick
+from modules.cache import LRUCache
+
+WORD_PATTERN = re.compile(r'\w+')
+PARENTHESES_PATTERN = re.compile(r'\([^)]*\)')
+GLOSS_SEPARATORS = re.compile(r'[/,;]')
+# Racine minimale pour rapprocher deux mots par leur racine commune : les
+# racines plus courtes ('ra' de 'maraina') rapprochent des mots sans rapport
+MIN_ROOT_LENGTH = 3
+
+
+def normalize_french(term):
+    """Normalise un terme français : minuscules, sans accents ni espaces superflus"""
+    decomposed = unicodedata.normalize('NFKD', term.lower())
+    without_accents = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(without_accents.split()).strip(' .!?')
+
+
+def split_gloss(gloss):
+    """Découpe une glose ('ville / main', 'frère (pour une femme)') en termes"""
+    gloss = PARENTHESES_PATTERN.sub(' ', gloss)
+    terms = (normalize_french(term) for term in GLOSS_SEPARATORS.split(gloss))
+    return [term for term in terms if term]
+
 
 class Translator:
-    def __init__(self):
-        """Initialise le traducteur"""
+    def __init__(self, lemmatizer=None, spell_checker=None, memo_size=4096):
+        """
+        Initialise le traducteur
+        
+        Args:
+            lemmatizer: Lemmatizer optionnel pour traduire les formes dérivées
+            spell_checker: SpellChecker optionnel pour traduire le mot
+                connu le plus proche d'un mot mal orthographié
+            memo_size: nombre de traductions de repli gardées en cache
+        """
         self.mg_to_fr = self._load_dictionary()
-        self.fr_to_mg = {v: k for k, v in self.mg_to_fr.items()}
+        self.lemmatizer = lemmatizer
+        self.spell_checker = spell_checker
+        
+        # Analyses morphologiques et recherches approchées mémorisées
+        self._fallback_memo = LRUCache(memo_size)
+        
+        # Variante de racine -> entrées du dictionnaire qui la partagent
+        self._lemma_index = {}
+        if lemmatizer is not None:
+            for key in self.mg_to_fr:
+                if ' ' not in key:
+                    for variant in lemmatizer.root_variants(key):
+                        self._lemma_index.setdefault(variant, []).append(key)
+        
+        # Index inverse : terme français normalisé -> toutes ses sources
+        self.fr_to_mg = self._build_reverse_index()
+        self._fr_terms = sorted(self.fr_to_mg)
+        
+        # Automate sur les entrées du dictionnaire découpées en mots,
+        # pour traduire des phrases entières (expressions comprises)
+        self.phrase_matcher = AhoCorasick(
+            (tuple(WORD_PATTERN.findall(key.lower())), key)
+            for key in self.mg_to_fr
+        )
     
     def _load_dictionary(self):
         """Charge le dictionnaire malagasy-français"""
@@ -148,6 +207,43 @@ class Translator:
             'rariny': 'justice'
         }
     
+    def _build_reverse_index(self):
+        """Construit l'index français -> malagasy à partir des gloses découpées"""
+        index = {}
+        for source, gloss in self.mg_to_fr.items():
+            for term in split_gloss(gloss):
+                sources = index.setdefault(term, [])
+                if source not in sources:
+                    sources.append(source)
+        return index
+    
+    def reverse_lookup(self, term):
+        """Retourne tous les mots malagasy traduits par un terme français"""
+        return list(self.fr_to_mg.get(normalize_french(term), []))
+    
+    def search_french(self, prefix, limit=10):
+        """
+        Recherche les termes français commençant par `prefix`
+        (recherche dichotomique dans les termes triés)
+        
+        Returns:
+            liste de {'french': terme, 'malagasy': [sources]}
+        """
+        prefix = normalize_french(prefix)
+        if not prefix:
+            return []
+        
+        results = []
+        i = bisect_left(self._fr_terms, prefix)
+        while i < len(self._fr_terms) and len(results) < limit:
+            term = self._fr_terms[i]
+            if not term.startswith(prefix):
+                break
+            results.append({'french': term, 'malagasy': list(self.fr_to_mg[term])})
+            i += 1
+        
+        return results
+    
     def translate(self, word, to_french=True):
         """
         Traduit un mot
@@ -164,13 +260,146 @@ class Translator:
         if to_french:
             return self.mg_to_fr.get(word_lower)
         else:
-            return self.fr_to_mg.get(word_lower)
+            sources = self.fr_to_mg.get(normalize_french(word_lower))
+            return sources[0] if sources else None
+    
+    def translate_with_fallback(self, word):
+        """
+        Traduit un mot malagasy en se repliant, si besoin, sur sa racine
+        (lemmatiseur) puis sur le mot connu le plus proche (correcteur)
+        
+        Returns:
+            dictionnaire avec la traduction, l'entrée utilisée ('source')
+            et le chemin qui l'a produite ('exact', 'lemma', 'spelling' ou None)
+        
+        >>> from modules.lemmatizer import Lemmatizer
+        >>> translator = Translator(lemmatizer=Lemmatizer())
+        >>> translator.translate_with_fallback('mihinanana')['path']
+        'lemma'
+        >>> translator.translate_with_fallback('fianarana')['source']
+        'mianatra'
+        >>> translator.translate_with_fallback('ra')['path'] is None
+        True
+        """
+        word_lower = word.lower().strip()
+        
+        if word_lower in self.mg_to_fr:
+            return {
+                'translation': self.mg_to_fr[word_lower],
+                'source': word_lower,
+                'path': 'exact'
+            }
+        
+        generation = self._fallback_memo.generation
+        cached = self._fallback_memo.get(word_lower)
+        if cached is None:
+            cached = self._translate_fallback(word_lower)
+            self._fallback_memo.put(word_lower, cached, generation)
+        
+        return dict(cached)
+    
+    def _translate_fallback(self, word_lower):
+        """Recherche par la racine puis par correction orthographique"""
+        if self.lemmatizer is not None and word_lower:
+            # Variantes du mot, de la plus proche à la plus réduite : une
+            # variante qui est une entrée, ou qu'une entrée partage
+            for variant in self.lemmatizer.root_variants(word_lower):
+                candidates = [variant]
+                if len(variant) >= MIN_ROOT_LENGTH:
+                    candidates += self._lemma_index.get(variant, [])
+                for candidate in candidates:
+                    if candidate in self.mg_to_fr:
+                        return {
+                            'translation': self.mg_to_fr[candidate],
+                            'source': candidate,
+                            'path': 'lemma'
+                        }
+        
+        if self.spell_checker is not None and word_lower:
+            # Seule une suggestion très proche est retenue (faute de frappe) :
+            # une distance plus grande désigne souvent un autre mot, et sur
+            # un mot court ('ra' -> 'roa') une seule modification suffit
+            max_distance = 0 if len(word_lower) <= MIN_ROOT_LENGTH else 1 if len(word_lower) < 8 else 2
+            for suggestion in self.spell_checker.check(word_lower)['suggestions']:
+                if Levenshtein.distance(word_lower, suggestion) > max_distance:
+                    continue
+                if suggestion in self.mg_to_fr:
+                    return {
+                        'translation': self.mg_to_fr[suggestion],
+                        'source': suggestion,
+                        'path': 'spelling'
+                    }
+        
+        return {'translation': None, 'source': None, 'path': None}
+    
+    def translate_text(self, text):
+        """
+        Traduit un texte complet mot à mot en une seule passe
+        
+        Les expressions du dictionnaire (ex: 'misaotra betsaka') sont
+        reconnues en priorité, la plus longue l'emportant ; les mots
+        inconnus, la ponctuation et les retours à la ligne sont conservés
+        tels quels.
+        
+        Returns:
+            dictionnaire avec les segments alignés et la traduction assemblée
+        """
+        words = list(WORD_PATTERN.finditer(text))
+        tokens = [match.group().lower() for match in words]
+        
+        segments = []
+        position = 0
+        def accept(start, end):
+            # Une expression ne franchit que des espaces (pas de ponctuation
+            # ni de retour à la ligne entre ses mots)
+            return all(
+                not text[words[i].end():words[i + 1].start()].strip(' \t')
+                for i in range(start, end - 1)
+            )
+        
+        for start, end, key in self.phrase_matcher.longest_matches(tokens, accept):
+            # Mots inconnus avant l'expression reconnue
+            segments.extend(self._unknown_segment(match) for match in words[position:start])
+            segments.append({
+                'text': text[words[start].start():words[end - 1].end()],
+                'start': words[start].start(),
+                'end': words[end - 1].end(),
+                'source': key,
+                'translation': self.mg_to_fr[key]
+            })
+            position = end
+        segments.extend(self._unknown_segment(match) for match in words[position:])
+        
+        # Le texte entre les segments (ponctuation, espaces, retours à la
+        # ligne) est recopié tel quel
+        parts = []
+        position = 0
+        for segment in segments:
+            parts.append(text[position:segment['start']])
+            parts.append(segment['translation'] or segment['text'])
+            position = segment['end']
+        parts.append(text[position:])
+        
+        return {
+            'segments': segments,
+            'translation': ''.join(parts)
+        }
+    
+    def _unknown_segment(self, match):
+        """Segment d'un mot absent du dictionnaire (conservé tel quel)"""
+        return {
+            'text': match.group(),
+            'start': match.start(),
+            'end': match.end(),
+            'source': None,
+            'translation': None
+        }
     
     def get_all_translations(self, word):
         """Retourne toutes les traductions possibles"""
         word_lower = word.lower().strip()
         results = {
             'mg_to_fr': self.mg_to_fr.get(word_lower),
-            'fr_to_mg': self.fr_to_mg.get(word_lower)
+            'fr_to_mg': self.reverse_lookup(word_lower)
         }
         return results
@@ -1,20 +1,262 @@
 """
 Module de synthèse vocale (Text-to-Speech) pour le Malagasy
+Le texte est découpé en phrases : chaque phrase a son propre extrait audio
+en cache, et seules les phrases modifiées sont synthétisées à nouveau
 """
 import os
+import re
+import threading
+import time
+from collections import OrderedDict
 from gtts import gTTS
 import hashlib
 
+SENTENCE_PATTERN = re.compile(r'[^.!?\n]+[.!?]*')
+
+class GTTSEngine:
+    def __init__(self, lang='mg', fallback_lang='fr'):
+        """
+        Moteur gTTS (service en ligne)
+        
+        Args:
+            lang: langue de synthèse
+            fallback_lang: langue utilisée si la première échoue
+        """
+        self.lang = lang
+        self.fallback_lang = fallback_lang
+    
+    def save(self, text, path):
+        """Synthétise le texte dans un fichier MP3"""
+        try:
+            # Note: gTTS supporte le malagasy de manière basique
+            gTTS(text=text, lang=self.lang, slow=False).save(path)
+        except Exception as e:
+            print(f"Erreur TTS: {e}")
+            # Fallback vers le français si le malagasy n'est pas disponible
+            gTTS(text=text, lang=self.fallback_lang, slow=False).save(path)
+
+
+class StubEngine:
+    def __init__(self, delay=0):
+        """
+        Moteur local sans réseau, pour les tests et le développement
+        hors ligne : écrit un fichier factice après `delay` secondes
+        """
+        self.delay = delay
+        self.calls = 0
+    
+    def save(self, text, path):
+        """Écrit un faux fichier audio contenant le texte"""
+        self.calls += 1
+        time.sleep(self.delay)
+        with open(path, 'wb') as f:
+            f.write(b'ID3' + text.encode('utf-8'))
+
+
+class AudioCache:
+    def __init__(self, directory, max_bytes):
+        """
+        Cache de fichiers audio borné en octets (éviction LRU)
+        
+        L'index des fichiers est gardé en mémoire : une consultation ne
+        touche pas au système de fichiers.
+        
+        Args:
+            directory: dossier des fichiers MP3
+            max_bytes: taille totale maximale des fichiers
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        # Fichiers déjà présents, du moins au plus récemment utilisé
+        files = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith('.mp3'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+    
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.mp3")
+    
+    def url(self, key):
+        return f"/static/audio/{key}.mp3"
+    
+    def contains(self, key):
+        """Indique si l'entrée est en cache (et la marque comme utilisée)"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True
+            self.misses += 1
+            return False
+    
+    def read(self, key):
+        """Contenu d'une entrée, ou None si elle est absente"""
+        if not self.contains(key):
+            return None
+        try:
+            with open(self.path(key), 'rb') as f:
+                return f.read()
+        except OSError:
+            # Fichier supprimé hors du cache : oublier l'entrée
+            self.discard(key)
+            return None
+    
+    def put(self, key, temp_path):
+        """Ajoute un fichier (renommé depuis temp_path) puis évince si besoin"""
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, self.path(key))
+        
+        with self._lock:
+            self._bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict(keep=key)
+    
+    def __contains__(self, key):
+        # Consultation sans effet sur l'ordre LRU ni sur les statistiques
+        return key in self._entries
+    
+    def discard(self, key):
+        with self._lock:
+            self._bytes -= self._entries.pop(key, 0)
+    
+    def _evict(self, keep=None):
+        """Supprime les entrées les moins récemment utilisées (verrou tenu)"""
+        while self._bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            self._bytes -= self._entries.pop(key)
+            self.evictions += 1
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+    
+    def stats(self):
+        """Statistiques du cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0
+            }
+
+
 class TextToSpeech:
-    def __init__(self):
-        """Initialise le module TTS"""
+    def __init__(self, engine=None, max_bytes=100 * 1024 * 1024):
+        """
+        Initialise le module TTS
+        
+        Args:
+            engine: moteur de synthèse (objet avec save(text, path)) ;
+                GTTSEngine par défaut
+            max_bytes: taille maximale du cache audio
+        """
+        self.engine = engine or GTTSEngine()
         self.audio_dir = os.path.join('static', 'audio')
         os.makedirs(self.audio_dir, exist_ok=True)
+        self.cache = AudioCache(self.audio_dir, max_bytes)
+    
+    def text_hash(self, text):
+        """Empreinte d'un texte, utilisée comme nom de fichier"""
+        return hashlib.md5(text.encode()).hexdigest()
+    
+    def split_sentences(self, text):
+        """Phrases du texte, espaces normalisés"""
+        sentences = []
+        for match in SENTENCE_PATTERN.finditer(text):
+            sentence = ' '.join(match.group().split())
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+    
+    def _document_key(self, sentences):
+        """Clé de l'audio assemblé d'un texte"""
+        return self.text_hash('\n'.join(sentences))
+    
+    def cached_url(self, text):
+        """URL de l'audio s'il a déjà été généré, sinon None"""
+        sentences = self.split_sentences(text)
+        if not sentences:
+            return None
+        
+        key = self._document_key(sentences) if len(sentences) > 1 else self.text_hash(sentences[0])
+        return self.cache.url(key) if self.cache.contains(key) else None
+    
+    def _temp_path(self, key):
+        return os.path.join(self.audio_dir, f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+    
+    def _remove_temp(self, temp_path):
+        """Supprime un fichier temporaire resté après une erreur"""
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    
+    def _synthesize(self, sentence, key, read=False):
+        """
+        Synthétise une phrase dans le cache
+        
+        Returns:
+            contenu du fichier si `read`, sinon None
+        """
+        # Écrire à côté puis renommer : un fichier incomplet n'est
+        # jamais servi
+        temp_path = self._temp_path(key)
+        audio = None
+        try:
+            self.engine.save(sentence, temp_path)
+            if read:
+                with open(temp_path, 'rb') as f:
+                    audio = f.read()
+            self.cache.put(key, temp_path)
+        except Exception:
+            self._remove_temp(temp_path)
+            raise
+        return audio
+    
+    def _sentence_url(self, sentence):
+        """URL de l'audio d'une phrase, synthétisé s'il n'est pas en cache"""
+        key = self.text_hash(sentence)
+        if not self.cache.contains(key):
+            self._synthesize(sentence, key)
+        return self.cache.url(key)
+    
+    def _sentence_audio(self, sentence):
+        """Contenu audio d'une phrase : depuis le cache, sinon synthétisé"""
+        key = self.text_hash(sentence)
+        # read() oublie l'entrée si le fichier a disparu
+        audio = self.cache.read(key)
+        if audio is None:
+            audio = self._synthesize(sentence, key, read=True)
+        return audio
     
     def generate(self, text):
         """
         Génère un fichier audio à partir du texte
         
+        Chaque phrase est synthétisée (ou lue dans le cache) séparément,
+        puis les extraits MP3 sont mis bout à bout.
+        
         Args:
             text: texte à convertir en audio
         
@@ -24,29 +266,35 @@ class TextToSpeech:
         if not text or text.strip() == '':
             return None
         
-        # Créer un hash du texte pour le nom de fichier
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        filename = f"{text_hash}.mp3"
-        filepath = os.path.join(self.audio_dir, filename)
-        
-        # Vérifier si le fichier existe déjà
-        if os.path.exists(filepath):
-            return f"/static/audio/{filename}"
+        sentences = self.split_sentences(text)
+        if not sentences:
+            return None
         
         try:
-            # Utiliser gTTS avec la langue malagasy (mg)
-            # Note: gTTS supporte le malagasy de manière basique
-            tts = gTTS(text=text, lang='mg', slow=False)
-            tts.save(filepath)
+            if len(sentences) == 1:
+                return self._sentence_url(sentences[0])
+            
+            key = self._document_key(sentences)
+            if self.cache.contains(key):
+                return self.cache.url(key)
+            
+            clips = [self._sentence_audio(sentence) for sentence in sentences]
+            temp_path = self._temp_path(key)
+            try:
+                with open(temp_path, 'wb') as f:
+                    for clip in clips:
+                        f.write(clip)
+                self.cache.put(key, temp_path)
+            except Exception:
+                self._remove_temp(temp_path)
+                raise
             
-            return f"/static/audio/{filename}"
+            return self.cache.url(key)
         
         except Exception as e:
             print(f"Erreur TTS: {e}")
-            # Fallback vers le français si le malagasy n'est pas disponible
-            try:
-                tts = gTTS(text=text, lang='fr', slow=False)
-                tts.save(filepath)
-                return f"/static/audio/{filename}"
-            except:
-                return None
+            return None
+    
+    def cache_stats(self):
+        """Statistiques du cache audio"""
+        return self.cache.stats()
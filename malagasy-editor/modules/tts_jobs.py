@@ -0,0 +1,122 @@
+"""
+File de travaux de synthèse vocale
+La requête HTTP reçoit immédiatement un identifiant de travail ; la synthèse
+tourne dans un pool de threads borné et le client interroge le résultat
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from modules.cache import LRUCache
+
+
+class TTSJob:
+    def __init__(self, job_id):
+        """Travail de synthèse d'un texte"""
+        self.job_id = job_id
+        self.status = 'pending'
+        self.audio_url = None
+        self.error = None
+        self.future = None
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'audio_url': self.audio_url,
+            'error': self.error
+        }
+
+
+class TTSJobQueue:
+    def __init__(self, tts, max_workers=2, max_pending=100, max_jobs=1000):
+        """
+        Initialise la file
+
+        Args:
+            tts: instance TextToSpeech (son moteur fait la synthèse)
+            max_workers: nombre de synthèses simultanées
+            max_pending: nombre maximal de travaux en attente ou en cours
+            max_jobs: nombre de travaux dont le statut reste consultable
+        """
+        self.tts = tts
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='tts')
+        self._jobs = LRUCache(max_jobs)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, text):
+        """
+        Soumet un texte ; les demandes concurrentes d'un même texte
+        partagent le même travail (identifiant = empreinte du texte)
+
+        Returns:
+            le travail, ou None si la file est pleine
+        """
+        job_id = self.tts.text_hash(text)
+
+        with self._lock:
+            # Audio déjà en cache : pas de synthèse
+            audio_url = self.tts.cached_url(text)
+
+            job = self._jobs.get(job_id)
+            if job is not None and job.status in ('pending', 'running'):
+                return job
+            # Un travail terminé n'est réutilisé que si son fichier est
+            # encore en cache (sinon il a été évincé : nouvelle synthèse)
+            if job is not None and job.status == 'done' and audio_url == job.audio_url:
+                return job
+
+            job = TTSJob(job_id)
+
+            if audio_url:
+                job.status = 'done'
+                job.audio_url = audio_url
+                self._jobs.put(job_id, job)
+                return job
+
+            if self._pending >= self.max_pending:
+                return None
+
+            self._pending += 1
+            self._jobs.put(job_id, job)
+            job.future = self._executor.submit(self._run, job, text)
+            return job
+
+    def _run(self, job, text):
+        """Exécute la synthèse dans un thread du pool"""
+        job.status = 'running'
+        try:
+            job.audio_url = self.tts.generate(text)
+            if job.audio_url:
+                job.status = 'done'
+            else:
+                job.status = 'error'
+                job.error = 'synthèse impossible'
+        except Exception as e:
+            job.status = 'error'
+            job.error = str(e)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def get(self, job_id):
+        """Retourne le travail, ou None s'il est inconnu ou expiré"""
+        return self._jobs.get(job_id)
+
+    def wait(self, job_id, timeout=None):
+        """
+        Attend la fin d'un travail (au plus `timeout` secondes)
+
+        Returns:
+            le travail, ou None s'il est inconnu
+        """
+        job = self._jobs.get(job_id)
+        if job is not None and job.future is not None:
+            wait([job.future], timeout=timeout)
+        return job
+
+    def shutdown(self):
+        """Arrête le pool après les travaux en cours"""
+        self._executor.shutdown(wait=True)
@@ -23,6 +23,9 @@ const quill = new Quill('#editor', {
 // Variables globales
 let autocompleteEnabled = true;
 let currentText = '';
+let phoneticHighlights = [];
+// Session d'autocomplétion : id côté serveur et texte déjà envoyé
+let autocompleteSession = null;
 
 // Mise à jour des statistiques
 function updateStats() {
@@ -67,35 +70,44 @@ async function apiRequest(endpoint, data) {
 // Correcteur Orthographique
 document.getElementById('checkSpelling').addEventListener('click', async () => {
     const text = quill.getText();
-    const words = text.trim().split(/\s+/).filter(w => w.length > 0);
     
-    if (words.length === 0) {
+    if (text.trim().length === 0) {
         showNotification('Veuillez écrire du texte d\'abord', true);
         return;
     }
 
     showNotification('Vérification en cours...');
     
-    let errorsFound = 0;
-    for (const word of words) {
-        try {
-            const result = await apiRequest('/api/check-spelling', { word });
-            if (!result.correct) {
-                errorsFound++;
-                console.log(`Erreur: ${word}`, result);
-            }
-        } catch (error) {
-            console.error('Erreur vérification:', error);
-        }
-    }
+    try {
+        const result = await apiRequest('/api/check-document', { text });
+        result.errors.forEach(error => {
+            console.log(`Erreur: ${error.word} (${error.start}-${error.end})`, error);
+        });
+        highlightPhoneticViolations(result.phonetic_violations);
 
-    if (errorsFound === 0) {
-        showNotification('✓ Aucune erreur détectée !');
-    } else {
-        showNotification(`⚠ ${errorsFound} erreur(s) détectée(s)`, true);
+        if (result.errors.length === 0) {
+            showNotification('✓ Aucune erreur détectée !');
+        } else {
+            showNotification(`⚠ ${result.errors.length} erreur(s) détectée(s)`, true);
+        }
+    } catch (error) {
+        console.error('Erreur vérification:', error);
+        showNotification('Erreur lors de la vérification', true);
     }
 });
 
+// Surligne les combinaisons phonotactiques interdites
+function highlightPhoneticViolations(violations) {
+    phoneticHighlights.forEach(range => {
+        quill.formatText(range.start, range.end - range.start, 'background', false);
+    });
+
+    phoneticHighlights = violations.map(v => ({ start: v.word_start, end: v.word_end }));
+    phoneticHighlights.forEach(range => {
+        quill.formatText(range.start, range.end - range.start, 'background', '#ffd6d6');
+    });
+}
+
 // Autocomplétion
 let autocompleteTimeout;
 document.getElementById('autocompleteToggle').addEventListener('change', (e) => {
@@ -110,21 +122,62 @@ quill.on('text-change', async () => {
 
     clearTimeout(autocompleteTimeout);
     autocompleteTimeout = setTimeout(async () => {
-        const text = quill.getText().trim();
-        if (text.length < 2) return;
+        const rawText = quill.getText().replace(/\n$/, '');
+        if (rawText.trim().length < 2) return;
 
         try {
-            const result = await apiRequest('/api/autocomplete', { context: text });
+            const result = await autocompleteRequest(rawText);
+
+            // Mot en cours de saisie : compléter plutôt que prédire le suivant
+            if (result.prefix) {
+                if (result.completions && result.completions.length > 0) {
+                    showAutocompleteSuggestions(result.completions, result.prefix.length);
+                }
+                return;
+            }
+
             if (result.suggestions && result.suggestions.length > 0) {
                 showAutocompleteSuggestions(result.suggestions);
             }
         } catch (error) {
+            autocompleteSession = null;
             console.error('Erreur autocomplétion:', error);
         }
     }, 500);
 });
 
-function showAutocompleteSuggestions(suggestions) {
+// N'envoie que le texte ajouté depuis le dernier appel ; recrée la session
+// si le texte a été modifié ailleurs qu'à la fin ou si elle a expiré
+async function autocompleteRequest(rawText) {
+    if (autocompleteSession && rawText.startsWith(autocompleteSession.text)) {
+        const delta = rawText.slice(autocompleteSession.text.length);
+        autocompleteSession.text = rawText;
+        const result = await apiRequest('/api/autocomplete', {
+            session_id: autocompleteSession.id,
+            delta
+        });
+        if (!result.error) return result;
+    }
+
+    const result = await apiRequest('/api/autocomplete/session', { context: rawText });
+    autocompleteSession = { id: result.session_id, text: rawText };
+    return result;
+}
+
+// Le serveur n'utilise que les n - 1 derniers mots du contexte : seule la fin
+// du document est envoyée lors de l'apprentissage
+const LEARN_CONTEXT_WORDS = 4;
+const LEARN_CONTEXT_CHARS = 200;
+
+function learnContext(end) {
+    const start = Math.max(0, end - LEARN_CONTEXT_CHARS);
+    const words = quill.getText(start, end - start).match(/[\p{L}\p{N}_]+/gu) || [];
+    // Le premier mot peut être coupé par la fenêtre
+    if (start > 0) words.shift();
+    return words.slice(-LEARN_CONTEXT_WORDS).join(' ');
+}
+
+function showAutocompleteSuggestions(suggestions, replaceLength = 0) {
     const container = document.getElementById('autocompleteSuggestions');
     container.innerHTML = '';
     
@@ -134,7 +187,17 @@ function showAutocompleteSuggestions(suggestions) {
         item.textContent = word;
         item.addEventListener('click', () => {
             const currentLength = quill.getLength();
-            quill.insertText(currentLength - 1, ' ' + word);
+            const context = learnContext(currentLength - 1 - replaceLength);
+            // Apprentissage en ligne : le serveur ajoute la suggestion acceptée
+            apiRequest('/api/autocomplete/learn', { context, word })
+                .catch(error => console.error('Erreur apprentissage:', error));
+            if (replaceLength > 0) {
+                // Remplacer le mot partiel par la complétion
+                quill.deleteText(currentLength - 1 - replaceLength, replaceLength);
+                quill.insertText(currentLength - 1 - replaceLength, word);
+            } else {
+                quill.insertText(currentLength - 1, ' ' + word);
+            }
             container.classList.remove('show');
         });
         container.appendChild(item);
@@ -157,10 +220,10 @@ quill.root.addEventListener('contextmenu', async (e) => {
     if (!text) return;
 
     try {
-        const result = await apiRequest('/api/translate', { word: text });
+        const result = await apiRequest('/api/translate-text', { text });
         const translationDiv = document.getElementById('translationResult');
         
-        if (result.translation) {
+        if (result.segments.some(segment => segment.translation)) {
             translationDiv.innerHTML = `
                 <strong>${text}</strong><br>
                 <i class="fas fa-arrow-right"></i> ${result.translation}
@@ -185,7 +248,11 @@ document.getElementById('analyzeSentiment').addEventListener('click', async () =
     }
 
     try {
-        const result = await apiRequest('/api/analyze-sentiment', { text });
+        const result = await apiRequest('/api/analyze-sentiment', {
+            text,
+            mode: 'paragraph',
+            compact: true
+        });
         const resultDiv = document.getElementById('sentimentResult');
         
         const sentimentClass = `sentiment-${result.sentiment}`;
@@ -266,6 +333,18 @@ document.getElementById('extractEntities').addEventListener('click', async () =>
 });
 
 // Text-to-Speech
+// Soumet un travail de synthèse puis attend sa fin (attente longue côté serveur)
+async function textToSpeechJob(text) {
+    let job = await apiRequest('/api/text-to-speech/jobs', { text });
+    
+    while (job.status === 'pending' || job.status === 'running') {
+        const response = await fetch(`/api/text-to-speech/jobs/${job.job_id}?wait=10`);
+        job = await response.json();
+    }
+    
+    return job;
+}
+
 document.getElementById('textToSpeech').addEventListener('click', async () => {
     const selection = quill.getSelection();
     let text;
@@ -284,7 +363,7 @@ document.getElementById('textToSpeech').addEventListener('click', async () => {
     showNotification('Génération audio en cours...');
 
     try {
-        const result = await apiRequest('/api/text-to-speech', { text });
+        const result = await textToSpeechJob(text);
         
         if (result.audio_url) {
             const audio = new Audio(result.audio_url);